@@ -1,7 +1,9 @@
 from app.agents.openrouter_client import OpenRouterClient
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
 import logging
 import json
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -11,18 +13,117 @@ class ParserAgent:
     Uses Qwen3-VL to parse PDF content and extract structured startup data
     """
 
+    # Bump when the prompt or model changes - invalidates DocumentCache entries
+    PROMPT_VERSION = "3"
+
+    # Characters of deck text that go into the prompt
+    CONTEXT_CHARS = int(os.getenv("PARSER_CONTEXT_CHARS", "8000"))
+
+    # single = one call over the most salient pages; map_reduce = every chunk of a long
+    # deck is extracted concurrently and the partial results are merged locally
+    EXTRACTION_MODE = os.getenv("PARSER_EXTRACTION_MODE", "single")
+    CHARS_PER_TOKEN = 4
+    CHUNK_TOKENS = int(os.getenv("PARSER_CHUNK_TOKENS", "2000"))
+    MAX_CHUNKS = int(os.getenv("PARSER_MAX_CHUNKS", "24"))
+    CHUNK_CONCURRENCY = int(os.getenv("PARSER_CHUNK_CONCURRENCY", "8"))
+
+    SCALAR_FIELDS = ("name", "sector", "stage", "geography", "ticket_size_min", "ticket_size_max", "summary", "product")
+    LIST_FIELDS = ("team", "claims")
+
     @staticmethod
-    async def parse_pdf_content(pdf_text: str, pdf_data: Dict[str, Any]) -> Dict[str, Any]:
+    def chunk_chars() -> int:
+        return ParserAgent.CHUNK_TOKENS * ParserAgent.CHARS_PER_TOKEN
+
+    @staticmethod
+    def merge_extractions(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Deterministic reduce of per-chunk results (given in chunk order)
+        Scalars: first non-empty value; team/claims: ordered union without duplicates;
+        traction: distinct statements joined in order
+        """
+        merged: Dict[str, Any] = {}
+
+        for field in ParserAgent.SCALAR_FIELDS:
+            merged[field] = next(
+                (p.get(field) for p in partials if p.get(field) not in (None, "", [])),
+                None
+            )
+
+        for field in ParserAgent.LIST_FIELDS:
+            seen = set()
+            merged[field] = []
+            for partial in partials:
+                values = partial.get(field) or []
+                for value in values if isinstance(values, list) else [values]:
+                    key = str(value).strip().lower()
+                    if key and key not in seen:
+                        seen.add(key)
+                        merged[field].append(value)
+
+        traction = []
+        for partial in partials:
+            value = partial.get("traction")
+            if value and str(value).strip() not in traction:
+                traction.append(str(value).strip())
+        merged["traction"] = "; ".join(traction) or None
+
+        return merged
+
+    @staticmethod
+    async def parse_pdf_chunks(chunks: List[str], pdf_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Map-reduce extraction for long decks: one call per chunk, run concurrently,
+        merged with merge_extractions. Fails only if every chunk fails
+        """
+        semaphore = asyncio.Semaphore(ParserAgent.CHUNK_CONCURRENCY)
+
+        async def extract(index: int, chunk: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await ParserAgent.parse_pdf_content(chunk, pdf_data, part=(index + 1, len(chunks)))
+
+        results = await asyncio.gather(*[extract(i, chunk) for i, chunk in enumerate(chunks)])
+        partials = [r.get("data") or {} for r in results if r.get("success")]
+
+        if not partials:
+            return results[0] if results else {"success": False, "error": "No text to extract", "agent": "parser"}
+
+        if len(partials) < len(results):
+            logger.warning(f"Parser agent: {len(results) - len(partials)} of {len(results)} chunks failed")
+
+        return {
+            "success": True,
+            "data": ParserAgent.merge_extractions(partials),
+            "agent": "parser",
+            "chunks": len(chunks)
+        }
+
+    @staticmethod
+    async def parse_pdf_content(
+        pdf_text: str,
+        pdf_data: Dict[str, Any],
+        part: Optional[Tuple[int, int]] = None
+    ) -> Dict[str, Any]:
         """
         Parse PDF content and extract startup information
 
         Args:
             pdf_text: Extracted text from PDF
             pdf_data: Full PDF parsing result with tables
+            part: (index, count) when pdf_text is one chunk of a map-reduce extraction
 
         Returns:
             Structured startup data or error
         """
+        if part:
+            source_header = (
+                f"Pitch Deck Text (part {part[0]} of {part[1]} - other parts are extracted separately, "
+                f"so use null or [] for anything not stated in this part):"
+            )
+        else:
+            source_header = "Pitch Deck Text (most informative slides, in deck order):"
+
+        text_limit = ParserAgent.chunk_chars() if part else ParserAgent.CONTEXT_CHARS
+
         try:
             prompt = f"""# ROLE & EXPERTISE
 You are a Senior Data Extraction Specialist with 10+ years of experience analyzing startup pitch decks at top VC firms like Sequoia Capital, Andreessen Horowitz, and Y Combinator. You've processed 50,000+ pitch decks and have expert-level pattern recognition for extracting structured startup data from unstructured documents.
@@ -101,8 +202,8 @@ Before responding, verify:
 ✓ No placeholder or example data from instructions leaked into output
 
 # INPUT DATA
-Pitch Deck Text (first 8000 characters):
-{pdf_text[:8000]}
+{source_header}
+{pdf_text[:text_limit]}
 
 # OUTPUT FORMAT
 Return ONLY valid JSON (no markdown blocks, no explanations, just pure JSON):
@@ -1,16 +1,97 @@
-from fastapi import APIRouter, UploadFile, File, Form, BackgroundTasks, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, UploadFile, File, Form, Query, BackgroundTasks, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+import os
 import json
 import uuid
 import asyncio
-from app.services.supabase_client import get_supabase_client
+from app.services import repository
+from app.services.job_fingerprint import JobFingerprint
+from app.services.result_snapshot import ResultSnapshot
+from app.services.sheets_parser import GoogleSheetsParser
+from app.services.cache import (
+    job_cache, JobCache, encode_json, decode_json,
+    JOB_STATUS_CACHE_TTL_SECONDS, JOB_RESULTS_CACHE_TTL_SECONDS
+)
+from app.services.upload_scanner import UploadScanner, UploadRejected, MAX_UPLOAD_REQUEST_BYTES
+from app.services.upload_manager import UploadManager, upload_manager
+from app.services.archive_reader import ArchiveReader
+from app.services.event_bus import event_bus, TERMINAL_EVENTS
+from app.utils.projection import (
+    JOB_FIELDS, STARTUP_FIELDS, DUE_DILIGENCE_FIELDS,
+    parse_fields, parse_nested_fields, project, encode_cursor, decode_cursor
+)
 from app.workers.job_processor import JobProcessor
 from app.services.pdf_generator import PDFGenerator
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
-supabase = get_supabase_client()
+# Completed jobs with an identical fingerprint newer than this are reused (0 disables)
+JOB_DEDUP_WINDOW_HOURS = float(os.getenv("JOB_DEDUP_WINDOW_HOURS", "24"))
+# Extra cap for sheet jobs - the content hash already catches edits, this bounds how
+# long results from a live sheet are reused at all
+JOB_DEDUP_SHEET_WINDOW_HOURS = float(os.getenv("JOB_DEDUP_SHEET_WINDOW_HOURS", "24"))
+
+async def find_duplicate_job(fingerprint: str, window_hours: float = JOB_DEDUP_WINDOW_HOURS) -> Optional[dict]:
+    """Return the newest completed job with the same fingerprint inside the freshness window"""
+    if window_hours <= 0:
+        return None
+
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=window_hours)).isoformat()
+
+    return await repository.find_completed_job(fingerprint, cutoff)
+
+async def reuse_completed_job(duplicate: dict, job_data: dict) -> Optional[dict]:
+    """
+    Create the caller's own completed job on top of a finished job's results
+    The new job gets its own id and user_token - another job's token is never handed out.
+    Startups stay with the job that produced them (source_job_id); the results row and
+    snapshot are copied. Returns None if the source results are gone.
+    """
+    source_id = duplicate.get("source_job_id") or duplicate.get("id")
+    source = await repository.get_job_with_results(source_id)
+
+    if not source or not source.get("results"):
+        return None
+
+    job = await repository.create_job({
+        **job_data,
+        "status": "completed",
+        "source_job_id": source_id,
+        "progress": source.get("progress") or job_data.get("progress")
+    })
+
+    if not job:
+        return None
+
+    job_id = job.get("id")
+
+    results = source["results"]
+
+    snapshot_path = None
+    snapshot = await ResultSnapshot.load(results["snapshot_path"]) if results.get("snapshot_path") else None
+    if snapshot:
+        snapshot["job_id"] = job_id
+        snapshot_path = await ResultSnapshot.save(job_id, snapshot)
+
+    await repository.insert_results({
+        "job_id": job_id,
+        "top_startups": results.get("top_startups"),
+        "one_pager_path": results.get("one_pager_path"),
+        "snapshot_path": snapshot_path
+    })
+
+    return job
+
+async def resolve_data_job_id(job_id: str) -> Optional[str]:
+    """Job whose startups back this job's results - None if the job does not exist"""
+    job = await repository.get_job(job_id, columns="id,source_job_id")
+
+    if not job:
+        return None
+
+    return job.get("source_job_id") or job_id
 
 async def process_job_background(job_id: str):
     """Background task to process job"""
@@ -42,6 +123,22 @@ async def create_job(
 
         filters_data = json.loads(filters)
 
+        # Reject unsupported types / oversized declared sizes before touching any bytes
+        for file in files or []:
+            UploadScanner.check_declared(file.filename, file.size)
+
+        # One chunked pass per file: SHA-256, size limits and magic check without loading it whole
+        scanned_files = []
+        request_budget = MAX_UPLOAD_REQUEST_BYTES
+        for file in files or []:
+            scan = await UploadScanner.scan(file, request_budget)
+            request_budget -= scan["size"]
+
+            # Data rooms: check entry count / sizes from the central directory before accepting
+            if scan["file_type"] == "zip":
+                scan["documents"] = await asyncio.to_thread(ArchiveReader.inspect, file.file)
+            scanned_files.append((file, scan))
+
         # Create job in database
         job_data = {
             "status": "pending",
@@ -54,58 +151,82 @@ async def create_job(
             }
         }
 
-        job_response = supabase.table("jobs").insert(job_data).execute()
+        # Fingerprint input contents + thesis so identical submissions reuse a finished job
+        sheet_hash = None
+        if google_sheet_link:
+            sheet_hash = await GoogleSheetsParser.fetch_sheet_content_hash(google_sheet_link)
+
+        duplicate = None
+        job_data["fingerprint"] = None
+        # An unreadable sheet has no content to compare - no fingerprint, no reuse
+        if not google_sheet_link or sheet_hash:
+            job_data["fingerprint"] = JobFingerprint.compute(
+                file_hashes=[scan["sha256"] for _, scan in scanned_files],
+                filters=filters_data,
+                sheet_url=google_sheet_link,
+                sheet_content_hash=sheet_hash
+            )
 
-        if not job_response.data:
-            raise HTTPException(status_code=500, detail="Failed to create job")
+            duplicate = await find_duplicate_job(
+                job_data["fingerprint"],
+                min(JOB_DEDUP_WINDOW_HOURS, JOB_DEDUP_SHEET_WINDOW_HOURS) if google_sheet_link else JOB_DEDUP_WINDOW_HOURS
+            )
 
-        job = job_response.data[0]
-        job_id = job.get("id")
+        if duplicate:
+            job = await reuse_completed_job(duplicate, job_data)
+
+            if job:
+                logger.info(f"Duplicate submission - job {job.get('id')} reuses results of {job.get('source_job_id')}")
+                return {
+                    "job_id": job.get("id"),
+                    "user_token": job.get("user_token"),
+                    "status": "completed",
+                    "deduplicated": True,
+                    "message": "Identical job already analyzed - returning existing results"
+                }
 
-        # Upload files to Supabase Storage
-        if files:
-            for file in files:
-                file_content = await file.read()
-                file_path = f"{job_id}/{file.filename}"
-
-                # Upload to Supabase Storage
-                supabase.storage.from_("pitch-decks").upload(
-                    path=file_path,
-                    file=file_content,
-                    file_options={"content-type": file.content_type}
-                )
+        job = await repository.create_job(job_data)
 
-                # Detect file type from filename
-                filename_lower = file.filename.lower()
-                if filename_lower.endswith('.pdf'):
-                    file_type = "pdf"
-                elif filename_lower.endswith(('.xlsx', '.xls')):
-                    file_type = "excel"
-                elif filename_lower.endswith('.csv'):
-                    file_type = "csv"
-                else:
-                    file_type = "unknown"
-
-                # Create file record
-                file_data = {
-                    "job_id": job_id,
-                    "file_type": file_type,
-                    "original_name": file.filename,
-                    "storage_path": file_path
-                }
+        if not job:
+            raise HTTPException(status_code=500, detail="Failed to create job")
+
+        job_id = job.get("id")
 
-                supabase.table("files").insert(file_data).execute()
+        # Register every file record in one insert - uploads are still pending
+        file_rows = [
+            {
+                "job_id": job_id,
+                "file_type": scan["file_type"],
+                "original_name": file.filename,
+                "storage_path": f"{job_id}/{file.filename}",
+                "upload_status": "pending",
+                "content_hash": scan["sha256"]
+            }
+            for file, scan in scanned_files
+        ]
 
         # Handle Google Sheet link if provided
         if google_sheet_link:
-            sheet_data = {
+            file_rows.append({
                 "job_id": job_id,
                 "file_type": "sheet",
                 "original_name": google_sheet_link,  # Store URL as original_name
-                "storage_path": None  # No storage path for sheets
-            }
-
-            supabase.table("files").insert(sheet_data).execute()
+                "storage_path": None,  # No storage path for sheets
+                "upload_status": "ready"
+            })
+
+        file_records = await repository.insert_files(file_rows) if file_rows else []
+
+        # Stream files to storage in the background (bounded concurrency);
+        # the worker waits on each file's readiness before parsing it
+        for (file, scan), file_record in zip(scanned_files, file_records):
+            upload_manager.start(
+                file_record["id"],
+                file_record["storage_path"],
+                UploadManager.detach(file),
+                scan["size"],
+                file.content_type
+            )
 
         # Start processing in background
         background_tasks.add_task(process_job_background, job_id)
@@ -117,6 +238,9 @@ async def create_job(
             "message": "Job created successfully and processing started"
         }
 
+    except UploadRejected as e:
+        logger.warning(f"Upload rejected: {e.detail}")
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except json.JSONDecodeError as e:
         logger.error(f"JSON decode error: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Invalid filters JSON: {str(e)}")
@@ -127,78 +251,265 @@ async def create_job(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/{job_id}")
-async def get_job(job_id: str):
-    """Get job status and progress - REAL DATA ONLY!"""
+async def get_job(job_id: str, fields: Optional[str] = None):
+    """Get job status and progress - REAL DATA ONLY!
+
+    fields: optional comma separated projection, e.g. fields=status,progress
+    """
     try:
-        job_response = supabase.table("jobs").select("*").eq("id", job_id).execute()
+        try:
+            columns = parse_fields(fields, JOB_FIELDS)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        def expose_results(job: dict) -> dict:
+            # Only expose results once completed
+            results = job.pop("results", None)
+            if job.get("status") == "completed" and results:
+                job["results"] = results
+            return job
+
+        if columns:
+            # A cached full document answers any projection without a query
+            document = await job_cache.get(JobCache.job_key(job_id))
+            if document is not None:
+                return project(decode_json(document), columns)
+
+            # Uncached: select only the requested columns (status too when results decide on it).
+            # Partial rows are not cached - the cache only ever holds full documents
+            selected = [c for c in columns if c != "results"]
+            if "results" in columns:
+                if "status" not in selected:
+                    selected.append("status")
+                job = await repository.get_job_with_results(job_id, columns=",".join(selected))
+                job = expose_results(job) if job else None
+            else:
+                job = await repository.get_job(job_id, columns=",".join(selected))
+
+            if not job:
+                raise HTTPException(status_code=404, detail="Job not found")
+
+            return project(job, columns)
+
+        async def load_job_document() -> Optional[bytes]:
+            # Job + results in one round trip
+            job = await repository.get_job_with_results(job_id)
+            return encode_json(expose_results(job)) if job else None
+
+        # Read-through cache - the worker invalidates it on every progress write
+        document = await job_cache.get_or_load(
+            JobCache.job_key(job_id),
+            load_job_document,
+            ttl=lambda _: JOB_STATUS_CACHE_TTL_SECONDS
+        )
 
-        if not job_response.data:
+        if document is None:
             raise HTTPException(status_code=404, detail="Job not found")
 
-        job = job_response.data[0]
-
-        # If completed, get results
-        if job.get("status") == "completed":
-            results_response = supabase.table("results").select("*").eq("job_id", job_id).execute()
-
-            if results_response.data:
-                job["results"] = results_response.data[0]
-
-        return job
+        return Response(content=document, media_type="application/json")
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{job_id}/results")
-async def get_results(job_id: str):
-    """Get detailed job results - REAL DATA ONLY!"""
+async def open_job_stream(job_id: str):
+    """
+    Subscribe first, then read the current state, so no event between the two is lost
+    Returns (subscription, initial state event) - raises 404 if the job does not exist
+    """
+    subscription = await event_bus.subscribe(job_id)
+
     try:
-        # Get job
-        job_response = supabase.table("jobs").select("*").eq("id", job_id).execute()
+        job = await repository.get_job(job_id, columns="id,status,progress,error_log")
+    except Exception:
+        await subscription.close()
+        raise
 
-        if not job_response.data:
-            raise HTTPException(status_code=404, detail="Job not found")
+    if not job:
+        await subscription.close()
+        raise HTTPException(status_code=404, detail="Job not found")
 
-        job = job_response.data[0]
+    initial = {
+        "type": "snapshot",
+        "job_id": job_id,
+        "status": job.get("status"),
+        "progress": job.get("progress"),
+        "error_log": job.get("error_log")
+    }
 
-        if job.get("status") != "completed":
-            return {
-                "job_id": job_id,
-                "status": job.get("status"),
-                "message": "Job not completed yet",
-                "progress": job.get("progress")
-            }
+    return subscription, initial
 
-        # Get results
-        results_response = supabase.table("results").select("*").eq("job_id", job_id).execute()
+@router.get("/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """Server-Sent Events stream of progress, stage changes and per-startup completions"""
+    subscription, initial = await open_job_stream(job_id)
 
-        if not results_response.data:
-            raise HTTPException(status_code=404, detail="Results not found")
+    def format_event(event: dict) -> str:
+        return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
 
-        results = results_response.data[0]
-        top_startups = results.get("top_startups", [])
+    async def stream():
+        try:
+            yield format_event(initial)
 
-        # Get full details for each startup
-        detailed_startups = []
+            if initial["status"] in TERMINAL_EVENTS:
+                return
 
-        for startup_info in top_startups:
-            startup_id = startup_info.get("startup_id")
+            while not await request.is_disconnected():
+                event = await subscription.next_event()
 
-            # Get startup
-            startup_response = supabase.table("startups").select("*").eq("id", startup_id).execute()
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
 
-            # Get due diligence
-            dd_response = supabase.table("due_diligence").select("*").eq("startup_id", startup_id).execute()
+                yield format_event(event)
 
-            if startup_response.data and dd_response.data:
-                detailed_startups.append({
-                    "rank": startup_info.get("rank"),
-                    "startup": startup_response.data[0],
-                    "due_diligence": dd_response.data[0],
-                    "fit_reason": startup_info.get("fit_reason")
-                })
+                if event["type"] in TERMINAL_EVENTS:
+                    break
+        finally:
+            await subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/{job_id}/ws")
+async def job_events_websocket(websocket: WebSocket, job_id: str):
+    """WebSocket variant of the job event stream"""
+    await websocket.accept()
+
+    try:
+        subscription, initial = await open_job_stream(job_id)
+    except HTTPException as e:
+        await websocket.close(code=4404, reason=e.detail)
+        return
+
+    try:
+        await websocket.send_json(initial)
+
+        if initial["status"] in TERMINAL_EVENTS:
+            return
+
+        while True:
+            event = await subscription.next_event()
+
+            if event is None:
+                await websocket.send_json({"type": "keep-alive"})
+                continue
+
+            await websocket.send_json(event)
+
+            if event["type"] in TERMINAL_EVENTS:
+                break
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await subscription.close()
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """True if the Accept-Encoding header allows gzip - honours q-values (gzip;q=0 refuses it)"""
+    allowed = {}
+
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        allowed[coding] = quality
+
+    if "gzip" in allowed:
+        return allowed["gzip"] > 0
+    return allowed.get("*", 0) > 0
+
+def project_ranked_startups(ranked: list, columns: Optional[dict]) -> list:
+    """Apply a {"startup": [...], "due_diligence": [...]} projection to ranked result entries"""
+    if not columns:
+        return ranked
+
+    return [
+        {
+            **entry,
+            "startup": project(entry.get("startup"), columns.get("startup")),
+            "due_diligence": project(entry.get("due_diligence"), columns.get("due_diligence"))
+        }
+        for entry in ranked
+    ]
+
+@router.get("/{job_id}/results")
+async def get_results(job_id: str, request: Request, fields: Optional[str] = None):
+    """Get detailed job results - REAL DATA ONLY!
+
+    fields: optional dotted projection, e.g. fields=startup.name,startup.sector,due_diligence.success_rate
+    """
+    try:
+        try:
+            columns = parse_nested_fields(fields, {"startup": STARTUP_FIELDS, "due_diligence": DUE_DILIGENCE_FIELDS})
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # Completed jobs: the precomputed snapshot (cached, it never changes)
+        results_key = JobCache.results_key(job_id)
+        snapshot = await job_cache.get(results_key)
+
+        if snapshot is None:
+            # Job + results row in one round trip - jobs still running never touch storage
+            job = await repository.get_job_with_results(job_id)
+
+            if not job:
+                raise HTTPException(status_code=404, detail="Job not found")
+
+            if job.get("status") != "completed":
+                return {
+                    "job_id": job_id,
+                    "status": job.get("status"),
+                    "message": "Job not completed yet",
+                    "progress": job.get("progress")
+                }
+
+            if not job.get("results"):
+                raise HTTPException(status_code=404, detail="Results not found")
+
+            snapshot_path = job["results"].get("snapshot_path")
+            if snapshot_path:
+                snapshot = await ResultSnapshot.load_compressed(snapshot_path)
+                if snapshot:
+                    await job_cache.set(results_key, snapshot, JOB_RESULTS_CACHE_TTL_SECONDS)
+
+        if snapshot:
+            if columns:
+                document = ResultSnapshot.decode(snapshot)
+                document["startups"] = project_ranked_startups(document.get("startups", []), columns)
+                return document
+
+            if accepts_gzip(request.headers.get("accept-encoding", "")):
+                return Response(
+                    content=snapshot,
+                    media_type="application/json",
+                    headers={"Content-Encoding": "gzip"}
+                )
+            return ResultSnapshot.decode(snapshot)
+
+        # No usable snapshot - every ranked startup + due diligence in one more round trip
+        graph = await repository.get_result_graph(job_id, job=job)
+
+        detailed_startups = project_ranked_startups(graph["startups"], columns)
 
         return {
             "job_id": job_id,
@@ -211,16 +522,67 @@ async def get_results(job_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{job_id}/startups")
+async def list_job_startups(
+    job_id: str,
+    fields: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None
+):
+    """Every scored startup in a job, ranked by relevance score - keyset paginated
+
+    fields: optional comma separated projection (id and relevance_score are always included)
+    cursor: next_cursor from the previous page
+    """
+    try:
+        try:
+            columns = parse_fields(fields, STARTUP_FIELDS, always=("id", "relevance_score"))
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        data_job_id = await resolve_data_job_id(job_id)
+
+        if not data_job_id:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        # Fetch one extra row to know whether another page exists
+        rows = await repository.list_scored_startups(
+            data_job_id,
+            columns=",".join(columns) if columns else "*",
+            limit=limit + 1,
+            after=after
+        )
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor((last.get("relevance_score"), last.get("id")))
+
+        return {
+            "job_id": job_id,
+            "startups": page,
+            "next_cursor": next_cursor
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/{job_id}/cancel")
 async def cancel_job(job_id: str):
     """Cancel a running job"""
     try:
-        job_response = supabase.table("jobs").select("*").eq("id", job_id).execute()
+        job = await repository.get_job(job_id, columns="id")
 
-        if not job_response.data:
+        if not job:
             raise HTTPException(status_code=404, detail="Job not found")
 
-        supabase.table("jobs").update({"status": "cancelled"}).eq("id", job_id).execute()
+        await repository.update_job(job_id, {"status": "cancelled"})
+        await job_cache.invalidate_job(job_id)
+        await event_bus.publish(job_id, "cancelled", status="cancelled")
 
         return {"job_id": job_id, "status": "cancelled"}
 
@@ -233,24 +595,21 @@ async def cancel_job(job_id: str):
 async def download_startup_pdf(job_id: str, startup_id: str):
     """Download PDF report for a single startup - REAL PDF with graphs!"""
     try:
-        # Get startup
-        startup_response = supabase.table("startups").select("*").eq("id", startup_id).eq("job_id", job_id).execute()
+        # Get startup - reused jobs read it from the job that produced it
+        data_job_id = await resolve_data_job_id(job_id)
+        startup = await repository.get_startup(startup_id, job_id=data_job_id) if data_job_id else None
 
-        if not startup_response.data:
+        if not startup:
             raise HTTPException(status_code=404, detail="Startup not found")
 
-        startup = startup_response.data[0]
-
         # Get due diligence
-        dd_response = supabase.table("due_diligence").select("*").eq("startup_id", startup_id).execute()
+        dd = await repository.get_due_diligence(startup_id)
 
-        if not dd_response.data:
+        if not dd:
             raise HTTPException(status_code=404, detail="Due diligence not found")
 
-        dd = dd_response.data[0]
-
-        # Generate PDF with graphs
-        pdf_bytes = PDFGenerator.generate_startup_report(startup, dd)
+        # Generate PDF with graphs - CPU-bound rendering, keep it off the event loop
+        pdf_bytes = await asyncio.to_thread(PDFGenerator.generate_startup_report, startup, dd)
 
         # Return as downloadable file
         filename = f"{startup.get('name', 'startup').replace(' ', '_')}_Report.pdf"
@@ -272,36 +631,23 @@ async def download_startup_pdf(job_id: str, startup_id: str):
 async def download_portfolio_pdf(job_id: str):
     """Download complete portfolio report - REAL PDF with all startups!"""
     try:
-        # Get results
-        results_response = supabase.table("results").select("*").eq("job_id", job_id).execute()
+        job = await repository.get_job_with_results(job_id)
 
-        if not results_response.data:
+        if not job or not job.get("results"):
             raise HTTPException(status_code=404, detail="Results not found")
 
-        results = results_response.data[0]
-        top_startups = results.get("top_startups", [])
-
-        # Get full details for each startup
-        detailed_startups = []
-
-        for startup_info in top_startups:
-            startup_id = startup_info.get("startup_id")
-
-            # Get startup
-            startup_response = supabase.table("startups").select("*").eq("id", startup_id).execute()
-
-            # Get due diligence
-            dd_response = supabase.table("due_diligence").select("*").eq("startup_id", startup_id).execute()
+        # Prefer the finalize-time snapshot, fall back to assembling the graph
+        snapshot_path = job["results"].get("snapshot_path")
+        snapshot = await ResultSnapshot.load(snapshot_path) if snapshot_path else None
 
-            if startup_response.data and dd_response.data:
-                detailed_startups.append({
-                    "rank": startup_info.get("rank"),
-                    "startup": startup_response.data[0],
-                    "due_diligence": dd_response.data[0]
-                })
+        if snapshot:
+            detailed_startups = snapshot.get("startups", [])
+        else:
+            graph = await repository.get_result_graph(job_id, job=job)
+            detailed_startups = graph["startups"]
 
-        # Generate portfolio PDF
-        pdf_bytes = PDFGenerator.generate_portfolio_report(detailed_startups)
+        # Generate portfolio PDF - CPU-bound rendering, keep it off the event loop
+        pdf_bytes = await asyncio.to_thread(PDFGenerator.generate_portfolio_report, detailed_startups)
 
         return Response(
             content=pdf_bytes,
@@ -1,7 +1,12 @@
 import os
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.api import jobs
+from app.utils.loop_monitor import loop_monitor
+from app.services.cache import job_cache
+from app.services.upload_scanner import MAX_UPLOAD_REQUEST_BYTES
+from app.services.parse_pool import parse_pool
 
 app = FastAPI(title="VC Multi-Agent API", version="1.0.0")
 
@@ -24,9 +29,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Refuse oversized multipart bodies from Content-Length before they are spooled"""
+    if request.method == "POST" and request.url.path.rstrip("/") == "/api/jobs":
+        content_length = request.headers.get("content-length")
+        # Small allowance for multipart boundaries and form fields
+        if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_REQUEST_BYTES + 1024 * 1024:
+            return JSONResponse(status_code=413, content={"detail": "Upload exceeds the per-request size limit"})
+
+    return await call_next(request)
+
 # Routes
 app.include_router(jobs.router, prefix="/api")
 
+@app.on_event("startup")
+async def start_loop_monitor():
+    loop_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    await loop_monitor.stop()
+
+@app.on_event("shutdown")
+async def stop_parse_pool():
+    parse_pool.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "VC Multi-Agent API", "status": "running"}
@@ -34,3 +62,11 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
+
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics - event loop lag and job cache hit ratios"""
+    return {
+        "event_loop_lag": loop_monitor.stats(),
+        "job_cache": job_cache.stats()
+    }
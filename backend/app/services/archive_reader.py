@@ -0,0 +1,108 @@
+import os
+import zipfile
+from typing import List, Tuple
+from app.services.upload_scanner import (
+    UploadRejected, UploadScanner, SUPPORTED_UPLOADS, MAX_UPLOAD_FILE_BYTES, UPLOAD_CHUNK_SIZE
+)
+
+# Data-room limits - checked from the central directory at upload time and again in the worker
+ZIP_MAX_ENTRIES = int(os.getenv("ZIP_MAX_ENTRIES", "500"))
+ZIP_MAX_UNCOMPRESSED_BYTES = int(float(os.getenv("ZIP_MAX_UNCOMPRESSED_MB", "2048")) * 1024 * 1024)
+# Reject entries that inflate more than this (zip bombs)
+ZIP_MAX_COMPRESSION_RATIO = int(os.getenv("ZIP_MAX_COMPRESSION_RATIO", "100"))
+
+
+class ArchiveReader:
+    """
+    ZIP data rooms read entry by entry from memory or a spooled upload - nothing is extracted to disk
+    Only PDF/Excel/CSV entries are kept; folders, macOS metadata, hidden files and
+    other types are skipped
+    """
+
+    @staticmethod
+    def is_document(info: zipfile.ZipInfo) -> bool:
+        name = info.filename
+        base = os.path.basename(name)
+
+        if info.is_dir() or name.startswith("__MACOSX/") or not base or base.startswith("."):
+            return False
+
+        return UploadScanner.detect_file_type(base) not in (None, "zip")
+
+    @staticmethod
+    def list_documents(archive: zipfile.ZipFile) -> List[Tuple[zipfile.ZipInfo, str]]:
+        """(entry, file_type) for every supported document, enforcing the archive limits"""
+        infos = archive.infolist()
+
+        if len(infos) > ZIP_MAX_ENTRIES:
+            raise UploadRejected(413, f"Archive has {len(infos)} entries (limit {ZIP_MAX_ENTRIES})")
+
+        documents = []
+        total = 0
+
+        for info in infos:
+            if not ArchiveReader.is_document(info):
+                continue
+
+            if info.flag_bits & 0x1:
+                raise UploadRejected(422, f"Encrypted archive entries are not supported: {info.filename}")
+
+            if info.file_size > MAX_UPLOAD_FILE_BYTES:
+                raise UploadRejected(413, f"{info.filename} exceeds the {MAX_UPLOAD_FILE_BYTES // (1024 * 1024)}MB per-file limit")
+
+            if info.file_size > max(info.compress_size, 1) * ZIP_MAX_COMPRESSION_RATIO:
+                raise UploadRejected(422, f"{info.filename} has a suspicious compression ratio")
+
+            total += info.file_size
+            if total > ZIP_MAX_UNCOMPRESSED_BYTES:
+                raise UploadRejected(413, f"Archive expands beyond {ZIP_MAX_UNCOMPRESSED_BYTES // (1024 * 1024)}MB")
+
+            documents.append((info, UploadScanner.detect_file_type(os.path.basename(info.filename))))
+
+        return documents
+
+    @staticmethod
+    def inspect(fileobj) -> int:
+        """Validate an uploaded archive from its central directory - returns the document count"""
+        try:
+            with zipfile.ZipFile(fileobj) as archive:
+                documents = ArchiveReader.list_documents(archive)
+        except zipfile.BadZipFile:
+            raise UploadRejected(415, "Not a valid ZIP archive")
+        finally:
+            fileobj.seek(0)
+
+        if not documents:
+            raise UploadRejected(422, "Archive contains no PDF, Excel or CSV files")
+
+        return len(documents)
+
+    @staticmethod
+    def read_entry(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
+        """
+        Decompress one entry, capped at MAX_UPLOAD_FILE_BYTES regardless of what its header claims
+        Raises UploadRejected if the entry is oversized or its content does not match its extension
+        """
+        extension = os.path.splitext(info.filename.lower())[1]
+        magic = SUPPORTED_UPLOADS[extension][1]
+        chunks = []
+        size = 0
+
+        with archive.open(info) as entry:
+            while True:
+                chunk = entry.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if size > MAX_UPLOAD_FILE_BYTES:
+                    raise UploadRejected(413, f"{info.filename} exceeds the per-file limit")
+
+                chunks.append(chunk)
+
+        data = b"".join(chunks)
+
+        if magic and not any(data.startswith(m) for m in magic):
+            raise UploadRejected(415, f"{info.filename} does not look like a valid {extension[1:].upper()} file")
+
+        return data
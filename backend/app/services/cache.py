@@ -0,0 +1,233 @@
+import os
+import time
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.services.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# In-process LRU size, and the max age of a local entry (bounds staleness across processes)
+CACHE_LOCAL_MAX_ITEMS = int(os.getenv("CACHE_LOCAL_MAX_ITEMS", "1024"))
+CACHE_LOCAL_TTL_SECONDS = float(os.getenv("CACHE_LOCAL_TTL_SECONDS", "2"))
+
+# Job status documents are invalidated by the worker on every write; results are immutable
+JOB_STATUS_CACHE_TTL_SECONDS = int(os.getenv("JOB_STATUS_CACHE_TTL_SECONDS", "30"))
+JOB_RESULTS_CACHE_TTL_SECONDS = int(os.getenv("JOB_RESULTS_CACHE_TTL_SECONDS", "3600"))
+
+# How long Redis keeps a key's invalidation counter - far longer than any cached value lives
+CACHE_GENERATION_TTL_SECONDS = 86400
+
+# Write the value only if no invalidate() bumped the key's generation since the read started
+SET_IF_GENERATION = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[2] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class JobCache:
+    """
+    Two-level read-through cache for job status and results documents
+    L1: in-process LRU, L2: Redis (shared by API and worker processes, optional)
+    Values are bytes so gzipped snapshots can be served without re-encoding
+
+    Every invalidate() bumps a per-key generation (in-process and in Redis). A read-through
+    load remembers the generation it started under and only caches its result if that
+    generation is still current - a row fetched before a worker write can never be
+    stored after the write's invalidation
+    """
+
+    def __init__(self, max_items: int = CACHE_LOCAL_MAX_ITEMS, local_ttl: float = CACHE_LOCAL_TTL_SECONDS):
+        self.max_items = max_items
+        self.local_ttl = local_ttl
+        self.local: "OrderedDict[str, tuple]" = OrderedDict()
+        self.generations: "OrderedDict[str, int]" = OrderedDict()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    @staticmethod
+    def job_key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def results_key(job_id: str) -> str:
+        return f"job:{job_id}:results"
+
+    @staticmethod
+    def generation_key(key: str) -> str:
+        return f"{key}:gen"
+
+    def _get_local(self, key: str) -> Optional[bytes]:
+        entry = self.local.get(key)
+
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.local[key]
+            return None
+
+        self.local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: bytes, ttl: float):
+        self.local[key] = (time.monotonic() + min(ttl, self.local_ttl), value)
+        self.local.move_to_end(key)
+
+        while len(self.local) > self.max_items:
+            self.local.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = self._get_local(key)
+        if value is not None:
+            self.local_hits += 1
+            return value
+
+        client = get_redis_client()
+        if client is not None:
+            try:
+                value = await client.get(key)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Redis cache read failed: {str(e)}")
+                value = None
+
+            if value is not None:
+                self.redis_hits += 1
+                ttl = await self._remaining_ttl(client, key)
+                self._set_local(key, value, ttl)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def _remaining_ttl(self, client, key: str) -> float:
+        try:
+            ttl = await client.ttl(key)
+            return ttl if ttl and ttl > 0 else self.local_ttl
+        except Exception:
+            return self.local_ttl
+
+    async def _redis_generation(self, client, key: str) -> Optional[int]:
+        """Current Redis generation of a key, None if it cannot be read"""
+        try:
+            return int(await client.get(JobCache.generation_key(key)) or 0)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Redis cache read failed: {str(e)}")
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: int, generation: Optional[tuple] = None):
+        """
+        generation: (local, redis) generations from before the value was loaded -
+        the write is dropped at each level where the key was invalidated since
+        """
+        if generation is not None and self.generations.get(key, 0) != generation[0]:
+            return
+
+        self._set_local(key, value, ttl)
+
+        client = get_redis_client()
+        if client is None:
+            return
+
+        try:
+            if generation is None:
+                await client.set(key, value, ex=ttl)
+            elif generation[1] is not None:
+                stored = await client.eval(
+                    SET_IF_GENERATION, 2, key, JobCache.generation_key(key), value, str(generation[1]), ttl
+                )
+                if not stored:
+                    # Another process invalidated it meanwhile - don't serve it locally either
+                    self.local.pop(key, None)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Redis cache write failed: {str(e)}")
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[bytes]]],
+        ttl: Callable[[bytes], Optional[int]]
+    ) -> Optional[bytes]:
+        """
+        Read-through: return the cached value or call loader and cache its result
+        ttl(value) picks the expiry per value - return None to skip caching it
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        # Generations before the load - a concurrent invalidate() makes the result uncacheable
+        client = get_redis_client()
+        generation = (
+            self.generations.get(key, 0),
+            await self._redis_generation(client, key) if client is not None else None
+        )
+
+        value = await loader()
+        if value is not None:
+            expiry = ttl(value)
+            if expiry:
+                await self.set(key, value, expiry, generation=generation)
+
+        return value
+
+    async def invalidate(self, key: str):
+        """Drop a key and bump its generation so in-flight loads cannot re-cache old data"""
+        self.generations[key] = self.generations.get(key, 0) + 1
+        self.generations.move_to_end(key)
+        while len(self.generations) > self.max_items * 4:
+            self.generations.popitem(last=False)
+
+        self.local.pop(key, None)
+
+        client = get_redis_client()
+        if client is not None:
+            try:
+                generation_key = JobCache.generation_key(key)
+                async with client.pipeline(transaction=True) as pipe:
+                    pipe.incr(generation_key)
+                    pipe.expire(generation_key, CACHE_GENERATION_TTL_SECONDS)
+                    pipe.delete(key)
+                    await pipe.execute()
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Redis cache invalidation failed: {str(e)}")
+
+    async def invalidate_job(self, job_id: str):
+        """Drop the cached status document after the job row changed"""
+        await self.invalidate(JobCache.job_key(job_id))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "lookups": lookups,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.local_hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+            "local_hit_ratio": round(self.local_hits / lookups, 4) if lookups else 0.0,
+            "local_items": len(self.local),
+            "redis_enabled": get_redis_client() is not None,
+            "redis_errors": self.redis_errors
+        }
+
+
+def encode_json(document: Any) -> bytes:
+    return json.dumps(document, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def decode_json(data: bytes) -> Any:
+    return json.loads(data)
+
+
+job_cache = JobCache()
@@ -0,0 +1,106 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+
+class ColumnMapper:
+    """
+    Maps spreadsheet headers to startup fields - shared by the Excel/CSV and Google Sheets parsers
+    Each field gets at most one column and each column feeds at most one field
+    """
+
+    # Fields in output order (also the tiebreak order between equally good matches)
+    FIELDS = ["name", "sector", "stage", "geography", "ticket_size", "summary",
+              "website", "pdf_link", "team", "traction", "product"]
+
+    # Column name variations
+    COLUMN_MAPPINGS = {
+        "name": ["name", "company", "startup", "company name", "startup name", "business name"],
+        "sector": ["sector", "industry", "vertical", "category", "domain", "market"],
+        "stage": ["stage", "funding stage", "round", "series", "investment stage"],
+        "geography": ["geography", "location", "region", "country", "city", "market", "geo"],
+        "ticket_size": ["ticket_size", "ticket size", "funding", "investment", "amount", "raise", "capital"],
+        "summary": ["summary", "description", "about", "overview", "pitch", "brief"],
+        "website": ["website", "url", "link", "web", "site"],
+        "pdf_link": ["pdf_link", "pdf link", "deck", "pitch deck", "pdf", "document"],
+        "team": ["team", "founders", "founder", "ceo", "leadership"],
+        "traction": ["traction", "metrics", "revenue", "users", "growth", "customers"],
+        "product": ["product", "solution", "service", "offering", "what we do"]
+    }
+
+    # Match strength: whole header > whole word(s) inside the header > plain substring
+    EXACT, WORD, SUBSTRING = 3, 2, 1
+
+    @staticmethod
+    def normalize(header) -> str:
+        """Lowercase, underscores as spaces, collapsed whitespace"""
+        return " ".join(str(header).lower().replace("_", " ").split())
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def matchers() -> List[Tuple[int, str, frozenset, List[Tuple[str, "re.Pattern"]]]]:
+        """(field order, field, exact synonyms, [(synonym, word-boundary pattern)]) - compiled once"""
+        compiled = []
+
+        for order, field in enumerate(ColumnMapper.FIELDS):
+            synonyms = sorted({ColumnMapper.normalize(s) for s in ColumnMapper.COLUMN_MAPPINGS[field]}, key=len, reverse=True)
+            compiled.append((
+                order,
+                field,
+                frozenset(synonyms),
+                [(s, re.compile(rf"\b{re.escape(s)}\b")) for s in synonyms]
+            ))
+
+        return compiled
+
+    @staticmethod
+    def score(header: str, exact: frozenset, patterns: List[Tuple[str, "re.Pattern"]]) -> Tuple[int, int]:
+        """(strength, matched synonym length) of the best match, (0, 0) if none"""
+        if header in exact:
+            return ColumnMapper.EXACT, len(header)
+
+        for synonym, pattern in patterns:
+            if pattern.search(header):
+                return ColumnMapper.WORD, len(synonym)
+
+        for synonym, _ in patterns:
+            # Short headers ("id", "no") would otherwise match inside every synonym
+            if synonym in header or (len(header) >= 3 and header in synonym):
+                return ColumnMapper.SUBSTRING, len(synonym)
+
+        return 0, 0
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _map_normalized(headers: Tuple[str, ...]) -> Tuple[Tuple[str, int], ...]:
+        candidates = []
+
+        for order, field, exact, patterns in ColumnMapper.matchers():
+            for index, header in enumerate(headers):
+                if not header:
+                    continue
+
+                strength, length = ColumnMapper.score(header, exact, patterns)
+                if strength:
+                    candidates.append((-strength, -length, order, index, field))
+
+        # Best matches claim their column first; ties go to the longer synonym, then field order
+        assigned: Dict[str, int] = {}
+        taken = set()
+
+        for _, _, _, index, field in sorted(candidates):
+            if field in assigned or index in taken:
+                continue
+            assigned[field] = index
+            taken.add(index)
+
+        return tuple((field, assigned[field]) for field in ColumnMapper.FIELDS if field in assigned)
+
+    @staticmethod
+    def map_headers(headers: Sequence) -> Dict[str, int]:
+        """
+        {field: column index} for a header row
+        Cached by the normalised header tuple - exports of the same layout map once
+        """
+        normalized = tuple(ColumnMapper.normalize(h) for h in headers)
+        return dict(ColumnMapper._map_normalized(normalized))
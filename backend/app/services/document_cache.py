@@ -0,0 +1,60 @@
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Dict, Any, Optional
+from app.services import repository
+from app.services.pdf_parser import PDFParser
+from app.agents.agent_parser import ParserAgent
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentCache:
+    """
+    PDF extraction + parser agent results keyed by the SHA-256 of the PDF bytes
+    The key also carries PDFParser.VERSION, ParserAgent.PROMPT_VERSION and a digest of
+    the extraction options (table mode, text budget, context size...), so changing any
+    of them makes old entries unreachable instead of stale
+    """
+
+    @staticmethod
+    async def hash_pdf(data: bytes) -> str:
+        # Decks can be tens of MB - keep the hashing off the event loop
+        return await asyncio.to_thread(lambda: hashlib.sha256(data).hexdigest())
+
+    @staticmethod
+    def cache_key(content_hash: str, options: Dict[str, Any]) -> str:
+        """options: every setting that shapes the parse or the prompt for this document"""
+        options_digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        return (
+            f"{content_hash}:pdf-{PDFParser.VERSION}"
+            f":prompt-{ParserAgent.PROMPT_VERSION}-{ParserAgent.EXTRACTION_MODE}"
+            f":opts-{options_digest}"
+        )
+
+    @staticmethod
+    async def get(content_hash: str, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached {parsed, extracted} for this PDF, or None - a failed lookup is a miss"""
+        try:
+            entry = await repository.get_document_cache(DocumentCache.cache_key(content_hash, options))
+        except Exception as e:
+            logger.warning(f"Document cache lookup failed: {str(e)}")
+            return None
+
+        if not entry or not entry.get("extracted"):
+            return None
+
+        return entry
+
+    @staticmethod
+    async def put(content_hash: str, options: Dict[str, Any], parsed: Dict[str, Any], extracted: Dict[str, Any]):
+        try:
+            await repository.upsert_document_cache({
+                "cache_key": DocumentCache.cache_key(content_hash, options),
+                "content_hash": content_hash,
+                "parsed": parsed,
+                "extracted": extracted
+            })
+        except Exception as e:
+            logger.warning(f"Document cache write failed: {str(e)}")
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, Any, Optional, Set
+from app.services.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Seconds between keep-alive ticks on idle subscriptions
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+TERMINAL_EVENTS = {"completed", "failed", "cancelled"}
+
+
+class Subscription:
+    """
+    A live feed of one job's events
+    next_event() returns the next event dict, or None after a heartbeat interval with no events
+    """
+
+    def __init__(self, bus: "JobEventBus", job_id: str):
+        self.bus = bus
+        self.job_id = job_id
+        self.queue: Optional[asyncio.Queue] = None
+        self.pubsub = None
+
+    async def open(self) -> "Subscription":
+        client = get_redis_client()
+
+        if client is not None:
+            try:
+                self.pubsub = client.pubsub()
+                await self.pubsub.subscribe(JobEventBus.channel(self.job_id))
+                return self
+            except Exception as e:
+                # Same degradation as publish - Redis being down must not fail the stream
+                logger.warning(f"Redis subscribe failed, using in-process events: {str(e)}")
+                await self._drop_pubsub()
+
+        self._open_local()
+        return self
+
+    def _open_local(self):
+        self.queue = asyncio.Queue(maxsize=1000)
+        self.bus.local_subscribers.setdefault(self.job_id, set()).add(self.queue)
+
+    async def _drop_pubsub(self):
+        pubsub, self.pubsub = self.pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.close()
+            except Exception:
+                pass
+
+    async def next_event(self, timeout: float = EVENT_HEARTBEAT_SECONDS) -> Optional[Dict[str, Any]]:
+        if self.pubsub is not None:
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+            except Exception as e:
+                logger.warning(f"Redis subscription lost, using in-process events: {str(e)}")
+                await self._drop_pubsub()
+                self._open_local()
+                return None
+
+            if not message or message.get("type") != "message":
+                return None
+            return json.loads(message["data"])
+
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        if self.pubsub is not None:
+            try:
+                await self.pubsub.unsubscribe(JobEventBus.channel(self.job_id))
+                await self.pubsub.close()
+            except Exception as e:
+                logger.warning(f"Failed to close event subscription: {str(e)}")
+            self.pubsub = None
+
+        if self.queue is not None:
+            subscribers = self.bus.local_subscribers.get(self.job_id, set())
+            subscribers.discard(self.queue)
+            if not subscribers:
+                self.bus.local_subscribers.pop(self.job_id, None)
+            self.queue = None
+
+
+class JobEventBus:
+    """
+    Push channel for job progress, stage changes and per-startup completions
+    Uses Redis pub/sub when REDIS_URL is set (API and worker may be separate processes),
+    otherwise - or while Redis is unreachable - fans out to in-process subscribers
+    """
+
+    def __init__(self):
+        self.local_subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    @staticmethod
+    def channel(job_id: str) -> str:
+        return f"job:{job_id}:events"
+
+    async def publish(self, job_id: str, event_type: str, **data):
+        """Best effort - a failed publish never breaks the pipeline"""
+        event = {"type": event_type, "job_id": job_id, **data}
+
+        client = get_redis_client()
+        if client is not None:
+            try:
+                await client.publish(JobEventBus.channel(job_id), json.dumps(event, default=str))
+            except Exception as e:
+                logger.warning(f"Failed to publish {event_type} event: {str(e)}")
+
+        # In-process subscribers: every subscriber when Redis is off, those that fell back otherwise
+        for queue in list(self.local_subscribers.get(job_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping {event_type} event for slow subscriber on job {job_id}")
+
+    async def subscribe(self, job_id: str) -> Subscription:
+        return await Subscription(self, job_id).open()
+
+
+event_bus = JobEventBus()
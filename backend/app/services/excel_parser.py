@@ -1,48 +1,21 @@
 import pandas as pd
+import numpy as np
 import logging
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Tuple
 import io
+from app.services.column_mapper import ColumnMapper
 
 logger = logging.getLogger(__name__)
 
 class ExcelParser:
     """
     Parse Excel files (.xlsx, .xls) and CSV files
-    Flexible column mapping - handles various naming conventions
+    Flexible column mapping via ColumnMapper - handles various naming conventions
     """
 
-    # Column name variations (lowercase for matching)
-    COLUMN_MAPPINGS = {
-        "name": ["name", "company", "startup", "company name", "startup name", "business name"],
-        "sector": ["sector", "industry", "vertical", "category", "domain", "market"],
-        "stage": ["stage", "funding stage", "round", "series", "investment stage"],
-        "geography": ["geography", "location", "region", "country", "city", "market", "geo"],
-        "ticket_size": ["ticket_size", "ticket size", "funding", "investment", "amount", "raise", "capital"],
-        "summary": ["summary", "description", "about", "overview", "pitch", "brief"],
-        "website": ["website", "url", "link", "web", "site"],
-        "pdf_link": ["pdf_link", "pdf link", "deck", "pitch deck", "pdf", "document"],
-        "team": ["team", "founders", "founder", "ceo", "leadership"],
-        "traction": ["traction", "metrics", "revenue", "users", "growth", "customers"],
-        "product": ["product", "solution", "service", "offering", "what we do"]
-    }
-
-    @staticmethod
-    def find_column(df_columns: List[str], field_name: str) -> str:
-        """Find the best matching column name from variations"""
-        possible_names = ExcelParser.COLUMN_MAPPINGS.get(field_name, [field_name])
-
-        # Try exact match first
-        for col in df_columns:
-            if col in possible_names:
-                return col
-
-        # Try partial match
-        for col in df_columns:
-            for possible in possible_names:
-                if possible in col or col in possible:
-                    return col
-
-        return None
+    # Fields of every parsed row, in output order
+    OUTPUT_FIELDS = ColumnMapper.FIELDS
 
     @staticmethod
     def parse_excel(file_bytes: bytes, filename: str) -> Dict[str, Any]:
@@ -81,48 +54,37 @@ class ExcelParser:
             df_cols = df.columns.tolist()
 
             # Map columns intelligently
-            column_map = {}
-            for field in ["name", "sector", "stage", "geography", "ticket_size", "summary",
-                         "website", "pdf_link", "team", "traction", "product"]:
-                found_col = ExcelParser.find_column(df_cols, field)
-                if found_col:
-                    column_map[field] = found_col
+            column_map = {
+                field: df_cols[index]
+                for field, index in ColumnMapper.map_headers(df_cols).items()
+            }
 
             logger.info(f"Column mapping: {column_map}")
 
-            startups = []
-
-            for idx, row in df.iterrows():
-                try:
-                    startup = {
-                        "name": str(row.get(column_map.get("name", "name"), "")).strip(),
-                        "sector": str(row.get(column_map.get("sector", "sector"), "")).strip(),
-                        "stage": str(row.get(column_map.get("stage", "stage"), "")).strip(),
-                        "geography": str(row.get(column_map.get("geography", "geography"), "")).strip(),
-                        "ticket_size": str(row.get(column_map.get("ticket_size", "ticket_size"), "")).strip(),
-                        "summary": str(row.get(column_map.get("summary", "summary"), "")).strip(),
-                        "website": str(row.get(column_map.get("website", "website"), "")).strip(),
-                        "pdf_link": str(row.get(column_map.get("pdf_link", "pdf_link"), "")).strip(),
-                        "team": str(row.get(column_map.get("team", "team"), "")).strip(),
-                        "traction": str(row.get(column_map.get("traction", "traction"), "")).strip(),
-                        "product": str(row.get(column_map.get("product", "product"), "")).strip()
-                    }
-
-                    # Skip empty rows
-                    if not startup["name"] or startup["name"] == "nan":
-                        continue
-
-                    # Parse ticket size if present
-                    if startup["ticket_size"] and startup["ticket_size"] != "nan":
-                        startup["parsed_ticket_size"] = ExcelParser.parse_ticket_size(
-                            startup["ticket_size"]
-                        )
-
-                    startups.append(startup)
-
-                except Exception as e:
-                    logger.warning(f"Failed to parse row {idx + 2}: {str(e)}")
-                    continue
+            # Whole-column string normalisation - same text as str(cell).strip() per row
+            # (missing columns become "", NaN cells become "nan")
+            columns = {
+                field: ExcelParser.normalize_column(df, column_map.get(field, field))
+                for field in ExcelParser.OUTPUT_FIELDS
+            }
+
+            # Skip empty rows
+            keep = (columns["name"] != "") & (columns["name"] != "nan")
+            columns = {field: values[keep] for field, values in columns.items()}
+
+            # Parse ticket size if present
+            ticket = columns["ticket_size"]
+            has_ticket = ((ticket != "") & (ticket != "nan")).to_numpy()
+            ticket_min, ticket_max = ExcelParser.parse_ticket_sizes(ticket)
+
+            startups = [
+                dict(zip(ExcelParser.OUTPUT_FIELDS, values))
+                for values in zip(*(columns[field].tolist() for field in ExcelParser.OUTPUT_FIELDS))
+            ]
+
+            for startup, parsed, low, high in zip(startups, has_ticket, ticket_min, ticket_max):
+                if parsed:
+                    startup["parsed_ticket_size"] = {"min": low, "max": high}
 
             if not startups:
                 return {
@@ -143,6 +105,61 @@ class ExcelParser:
                 "error": f"Failed to parse file: {str(e)}"
             }
 
+    @staticmethod
+    def normalize_column(df: pd.DataFrame, column: str) -> pd.Series:
+        """str(cell).strip() for a whole column, or "" everywhere if the column is missing"""
+        if column not in df.columns:
+            return pd.Series("", index=df.index, dtype=object)
+
+        values = df[column]
+        if isinstance(values, pd.DataFrame):
+            # Duplicate header after lowercasing - use the first one
+            values = values.iloc[:, 0]
+
+        if pd.api.types.is_datetime64_any_dtype(values):
+            # astype(str) drops midnight times; keep str(Timestamp) output
+            values = values.map(str)
+
+        return values.astype(str).str.strip()
+
+    @staticmethod
+    def parse_ticket_sizes(tickets: pd.Series) -> Tuple[List[Any], List[Any]]:
+        """
+        Column version of parse_ticket_size - returns (mins, maxs) lists with None for unknown
+        Same rules: k/m multiplier, "-"/"to" ranges, "X+" open-ended
+        Exports repeat a handful of ticket strings, so only distinct values are parsed
+        """
+        codes, uniques = pd.factorize(tickets)
+        text = pd.Series(uniques, dtype=object).str.replace(" ", "", regex=False).str.lower()
+        numbers = text.str.findall(r"[\d.]+")
+        count = numbers.str.len().to_numpy()
+
+        first = pd.to_numeric(numbers.str[0], errors="coerce").to_numpy(dtype=float)
+        second = pd.to_numeric(numbers.str[1], errors="coerce").to_numpy(dtype=float)
+
+        multiplier = np.where(
+            text.str.contains("k", regex=False).to_numpy(), 1000.0,
+            np.where(text.str.contains("m", regex=False).to_numpy(), 1000000.0, 1.0)
+        )
+
+        is_range = (
+            text.str.contains("-", regex=False) | text.str.contains("to", regex=False)
+        ).to_numpy() & (count >= 2)
+        open_ended = text.str.contains("+", regex=False).to_numpy()
+
+        low = first * multiplier
+        high = np.where(is_range, second, np.where(open_ended, np.nan, first)) * multiplier
+
+        # A range with an unparseable bound yields neither value
+        broken_range = is_range & (np.isnan(first) | np.isnan(second))
+        low[broken_range] = np.nan
+        high[broken_range] = np.nan
+
+        low_values = np.array([None if np.isnan(v) else float(v) for v in low], dtype=object)
+        high_values = np.array([None if np.isnan(v) else float(v) for v in high], dtype=object)
+
+        return low_values[codes].tolist(), high_values[codes].tolist()
+
     @staticmethod
     def parse_ticket_size(ticket_str: str) -> Dict[str, Any]:
         """
@@ -150,8 +167,6 @@ class ExcelParser:
         Returns min and max values in dollars
         """
         try:
-            import re
-
             # Remove spaces and make lowercase
             ticket_str = str(ticket_str).replace(" ", "").lower()
 
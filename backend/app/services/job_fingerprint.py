@@ -0,0 +1,62 @@
+import hashlib
+import json
+from typing import Dict, Any, List, Optional
+
+
+class JobFingerprint:
+    """
+    Content fingerprint for a job submission
+    Identical decks + sheet contents + filters always produce the same fingerprint
+    """
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        """SHA-256 hex digest of raw bytes"""
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def normalize_filters(filters: Dict[str, Any]) -> str:
+        """
+        Canonical JSON for filters - key order, surrounding whitespace and
+        string casing must not change the fingerprint
+        """
+        def normalize(value: Any) -> Any:
+            if isinstance(value, dict):
+                return {str(k).strip().lower(): normalize(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [normalize(v) for v in value]
+            if isinstance(value, str):
+                return value.strip().lower()
+            return value
+
+        return json.dumps(normalize(filters or {}), sort_keys=True, separators=(",", ":"))
+
+    @staticmethod
+    def compute(
+        file_hashes: List[str],
+        filters: Dict[str, Any],
+        sheet_url: Optional[str] = None,
+        sheet_content_hash: Optional[str] = None
+    ) -> str:
+        """
+        Combine per-file hashes, the sheet URL + content hash and the normalised filters
+
+        Args:
+            file_hashes: SHA-256 digests of every uploaded file (order does not matter)
+            filters: Parsed filters JSON
+            sheet_url: Google Sheet link, if any
+            sheet_content_hash: SHA-256 of the sheet's CSV export, if any
+
+        Returns:
+            Hex fingerprint
+        """
+        payload = {
+            "files": sorted(file_hashes),
+            "sheet_url": (sheet_url or "").strip(),
+            "sheet_hash": sheet_content_hash or "",
+            "filters": JobFingerprint.normalize_filters(filters)
+        }
+
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True).encode("utf-8")
+        ).hexdigest()
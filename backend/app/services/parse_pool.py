@@ -0,0 +1,144 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional
+from app.services.pdf_parser import PDFParser
+
+try:
+    import resource
+except ImportError:  # not available on Windows - memory cap is skipped
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Parser processes, per-document time budget and per-process address space cap
+PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", "4"))
+PDF_PARSE_TIMEOUT_SECONDS = float(os.getenv("PDF_PARSE_TIMEOUT_SECONDS", "120"))
+PDF_PARSE_MEMORY_MB = int(os.getenv("PDF_PARSE_MEMORY_MB", "1024"))
+
+# Extra time the event loop gives a worker past its own deadline before killing the pool
+# (only reached when a parse is stuck inside native code and the in-worker alarm cannot fire)
+PDF_PARSE_KILL_GRACE_SECONDS = 15
+
+
+class ParseTimeout(BaseException):
+    """Raised in a worker when its parse runs out of time - BaseException so parse_pdf's handlers let it through"""
+
+
+def _on_alarm(signum, frame):
+    raise ParseTimeout()
+
+
+def _init_worker(memory_mb: int):
+    """Runs once in each parser process - a runaway document hits MemoryError instead of the host OOM killer"""
+    if resource is not None and memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def _parse_with_deadline(data: bytes, timeout: float, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs in a worker process - the time limit is enforced here, so a slow document
+    only stops its own parse and the pool keeps serving the others
+    """
+    alarm = hasattr(signal, "SIGALRM") and timeout > 0
+    if alarm:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        return PDFParser.parse_pdf(data, **options)
+    except ParseTimeout:
+        return {"success": False, "error": f"PDF parsing timed out after {timeout}s"}
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ParsePool:
+    """
+    CPU-bound PDF parsing in a pool of worker processes
+    Keeps the event loop responsive and lets multi-deck jobs use every core
+    At most one parse per worker is submitted, so the time limit covers running time
+    only - never time spent queued. Timeouts are enforced inside the worker; the pool
+    is only killed if a parse is stuck past the grace period, and parses it takes
+    down with it are retried once on a fresh pool
+    """
+
+    def __init__(
+        self,
+        workers: int = PDF_PARSE_WORKERS,
+        timeout: float = PDF_PARSE_TIMEOUT_SECONDS,
+        memory_mb: int = PDF_PARSE_MEMORY_MB
+    ):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.slots: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            # spawn: forking a process that runs DB and HTTP threads is not safe
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.memory_mb,)
+            )
+        return self.executor
+
+    def _reset(self, executor: ProcessPoolExecutor, kill: bool = False):
+        """Drop a broken or stuck pool; the next parse starts a fresh one"""
+        if self.executor is not executor:
+            return
+
+        self.executor = None
+
+        if kill:
+            for process in list((getattr(executor, "_processes", None) or {}).values()):
+                process.terminate()
+
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def parse_pdf(self, data: bytes, **options) -> Dict[str, Any]:
+        """
+        PDFParser.parse_pdf in a worker process - same result shape, errors returned not raised
+        options are passed through to parse_pdf (table_mode, table_engine, max_chars)
+        """
+        task = functools.partial(_parse_with_deadline, data, self.timeout, options)
+
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.workers)
+
+        async with self.slots:
+            for attempt in range(2):
+                executor = self._get_executor()
+                future = asyncio.get_running_loop().run_in_executor(executor, task)
+
+                try:
+                    return await asyncio.wait_for(future, self.timeout + PDF_PARSE_KILL_GRACE_SECONDS)
+                except asyncio.TimeoutError:
+                    logger.error(f"PDF parse stuck past {self.timeout}s - restarting parser pool")
+                    self._reset(executor, kill=True)
+                    return {"success": False, "error": f"PDF parsing timed out after {self.timeout}s"}
+                except BrokenProcessPool:
+                    logger.warning("PDF parser pool broke - retrying on a fresh pool")
+                    self._reset(executor)
+
+        return {"success": False, "error": "PDF parser process crashed"}
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+parse_pool = ParsePool()
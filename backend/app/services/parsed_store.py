@@ -0,0 +1,94 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+from typing import Dict, Any, Optional
+from app.services import repository
+
+logger = logging.getLogger(__name__)
+
+
+class ParsedStore:
+    """
+    Content-addressed storage for bulky parse output
+    The full extraction is gzipped into object storage under its SHA-256;
+    the files row only keeps a small summary plus a reference to it
+    """
+
+    PREFIX = "parsed"
+
+    @staticmethod
+    def storage_path(content_hash: str) -> str:
+        return f"{ParsedStore.PREFIX}/{content_hash[:2]}/{content_hash}.json.gz"
+
+    @staticmethod
+    def encode(payload: Dict[str, Any]) -> tuple:
+        """Canonical JSON -> (sha256 of the JSON, gzipped bytes) - mtime=0 keeps output deterministic"""
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        return hashlib.sha256(body).hexdigest(), gzip.compress(body, compresslevel=6, mtime=0)
+
+    @staticmethod
+    def compact_pdf_payload(pdf_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Drop the duplicated views of a PDFParser result
+        full_text, text_data and table_data are all derivable from pages + tables
+        """
+        return {
+            "pages": pdf_data.get("pages", []),
+            "tables": pdf_data.get("tables", [])
+        }
+
+    @staticmethod
+    def pdf_summary(pdf_data: Dict[str, Any]) -> Dict[str, Any]:
+        pages = pdf_data.get("pages", [])
+        return {
+            "success": pdf_data.get("success", False),
+            "total_pages": pdf_data.get("total_pages", len(pages)),
+            "pages_extracted": len(pages),
+            "char_count": sum(len(p.get("text", "")) for p in pages),
+            "table_count": len(pdf_data.get("tables", []))
+        }
+
+    @staticmethod
+    def rows_summary(result: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "success": result.get("success", False),
+            "total_rows": result.get("total_rows", len(result.get("startups", [])))
+        }
+
+    @staticmethod
+    async def save(payload: Dict[str, Any], summary: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Offload payload and return the document to store in files.parsed:
+        the summary plus a content_ref to the compressed payload
+        """
+        content_hash, compressed = await asyncio.to_thread(ParsedStore.encode, payload)
+        path = ParsedStore.storage_path(content_hash)
+
+        try:
+            # Same content always lands on the same key, so overwriting is harmless
+            await repository.upload_file(path, compressed, "application/gzip", upsert=True)
+        except Exception as e:
+            logger.error(f"Failed to offload parsed payload {content_hash}: {str(e)}")
+            return {**summary, "content_ref": None}
+
+        return {
+            **summary,
+            "content_ref": {
+                "sha256": content_hash,
+                "path": path,
+                "compressed_bytes": len(compressed)
+            }
+        }
+
+    @staticmethod
+    async def load(parsed: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fetch the full payload referenced by a files.parsed document"""
+        ref = (parsed or {}).get("content_ref")
+
+        if not ref:
+            return None
+
+        data = await repository.download_file(ref["path"])
+        return json.loads(await asyncio.to_thread(gzip.decompress, data))
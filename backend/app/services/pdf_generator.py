@@ -10,9 +10,9 @@ from reportlab.graphics.shapes import Drawing
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.graphics.charts.piecharts import Pie
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
+from matplotlib.figure import Figure
 
 logger = logging.getLogger(__name__)
 
@@ -238,8 +238,10 @@ class PDFGenerator:
             competition = dd_data.get('competition_difficulty', 0)
             profit_margin = dd_data.get('profit_margin', 0)
 
-            # Create figure
-            fig, ax = plt.subplots(figsize=(6, 3))
+            # Create figure - a standalone Figure, not pyplot's global state, so
+            # reports can render concurrently on worker threads
+            fig = Figure(figsize=(6, 3))
+            ax = fig.subplots()
 
             metrics = ['Success Rate', 'Competition', 'Profit Margin']
             values = [success_rate, competition, profit_margin]
@@ -256,13 +258,12 @@ class PDFGenerator:
                 ax.text(value + 2, i, f'{value:.1f}',
                        va='center', fontsize=9, fontweight='bold')
 
-            plt.tight_layout()
+            fig.tight_layout()
 
             # Save to buffer
             img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+            fig.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
             img_buffer.seek(0)
-            plt.close()
 
             # Convert to ReportLab Image
             img = Image(img_buffer, width=5*inch, height=2.5*inch)
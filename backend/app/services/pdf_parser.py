@@ -1,37 +1,229 @@
+import io
+import os
+import re
 import fitz  # PyMuPDF
 import pdfplumber
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# A file path, or the PDF itself already in memory
+PDFSource = Union[str, bytes, bytearray, memoryview]
+
+# Table extraction: auto = only pages that look tabular, all = every page, none = skip
+# (callers can still ask for tables later via PDFParser.extract_tables)
+PDF_TABLE_MODE = os.getenv("PDF_TABLE_MODE", "auto")
+# pdfplumber (slower, more faithful cell splitting) or pymupdf (built-in table finder)
+PDF_TABLE_ENGINE = os.getenv("PDF_TABLE_ENGINE", "pdfplumber")
+
+# Page heuristics for auto mode
+TABLE_MIN_RULINGS = 6          # horizontal/vertical strokes or cell rectangles
+TABLE_MIN_ROWS = 4             # short lines dominated by numbers
+TABLE_NUMERIC_LINE_RATIO = 0.4
+
+NUMERIC_TOKEN = re.compile(r"^[\$€£(]?-?\d[\d,.]*[%kKmMbBx)]?$")
+
+# Page salience: cues for the slides the parser agent extracts fields from
+SALIENCE_KEYWORDS = {
+    "team": ("team", "founder", "co-founder", "ceo", "cto", "coo", "advisor", "ex-", "phd", "previously"),
+    "traction": ("traction", "revenue", "arr", "mrr", "customers", "users", "growth", "mom", "yoy",
+                 "pilot", "partnership", "retention", "gmv"),
+    "ask": ("raising", "the ask", "investment", "use of funds", "round", "pre-seed", "seed", "series",
+            "valuation", "runway"),
+    "market": ("market", "tam", "sam", "som", "competition", "competitor"),
+    "model": ("business model", "pricing", "subscription", "unit economics", "margin", "ltv", "cac"),
+    "product": ("product", "platform", "solution", "how it works", "technology"),
+}
+# Slides that rarely carry extractable facts
+LOW_VALUE_TITLES = ("agenda", "contents", "thank you", "thanks", "questions", "q&a", "vision", "mission",
+                    "disclaimer", "confidential", "appendix")
+SALIENCE_WORD = re.compile(r"[a-z][a-z&\-]*")
+
 class PDFParser:
     """Parse PDF files and extract text, images, tables"""
 
+    # Bump when extraction output changes - invalidates DocumentCache entries
+    VERSION = "4"
+
+    @staticmethod
+    def as_buffer(source: PDFSource) -> Union[str, bytes]:
+        """Paths pass through; in-memory sources become one bytes object both engines can share"""
+        if isinstance(source, str):
+            return source
+        if isinstance(source, bytes):
+            return source
+        return bytes(source)
+
+    @staticmethod
+    def open_pymupdf(source: PDFSource):
+        if isinstance(source, str):
+            return fitz.open(source)
+        return fitz.open(stream=source, filetype="pdf")
+
+    @staticmethod
+    def open_pdfplumber(source: PDFSource, pages: Optional[List[int]] = None):
+        """pages: 1-based page numbers to load (None = all)"""
+        if isinstance(source, str):
+            return pdfplumber.open(source, pages=pages)
+        # BytesIO over a bytes object shares its buffer instead of copying it
+        return pdfplumber.open(io.BytesIO(source), pages=pages)
+
+    @staticmethod
+    def iter_pages(doc, detect_tables: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Yield page-wise chunks of an open PyMuPDF document one page at a time
+        Nothing is extracted for pages the consumer never asks for
+        detect_tables: run the looks_tabular heuristic (only table_mode=auto uses it)
+        """
+        for page_num in range(len(doc)):
+            page = doc[page_num]
+            text = page.get_text()
+
+            # Extract images info
+            images = page.get_images()
+
+            page_data = {
+                "page_number": page_num + 1,
+                "text": text.strip(),
+                "image_count": len(images),
+                "salience": PDFParser.score_page(text)
+            }
+            if detect_tables:
+                page_data["table_candidate"] = PDFParser.looks_tabular(page, text)
+
+            yield page_data
+
+    @staticmethod
+    def score_page(text: str) -> float:
+        """
+        Local estimate of how many parser fields a page can fill
+        Keyword hits per field group (title hits weigh double), number density,
+        and a penalty for agenda / thank-you style slides
+        """
+        lines = [line.strip().lower() for line in text.splitlines() if line.strip()]
+        if not lines:
+            return 0.0
+
+        title = lines[0]
+        body = " ".join(lines)
+        words = SALIENCE_WORD.findall(body)
+        tokens = body.split()
+
+        score = 0.0
+        for keywords in SALIENCE_KEYWORDS.values():
+            hits = sum(body.count(k) if " " in k or "-" in k else words.count(k) for k in keywords)
+            if hits:
+                # Diminishing returns per group - covering several fields beats repeating one
+                score += 1.0 + min(hits, 5) * 0.2
+            if any(k in title for k in keywords):
+                score += 1.0
+
+        numbers = sum(1 for t in tokens if NUMERIC_TOKEN.match(t))
+        score += min(numbers / max(len(tokens), 1), 0.3) * 5
+
+        if any(title.startswith(t) for t in LOW_VALUE_TITLES) and len(tokens) < 60:
+            score *= 0.3
+
+        return round(score, 3)
+
+    @staticmethod
+    def select_context(pages: List[Dict[str, Any]], budget_chars: int) -> str:
+        """
+        Assemble the highest-salience pages into budget_chars of text
+        The first page always goes in (company name, tagline); chosen pages keep deck order
+        """
+        candidates = [p for p in pages if p.get("text")]
+        if not candidates:
+            return ""
+
+        separator = "\n\n"
+        first, rest = candidates[0], candidates[1:]
+        ranked = sorted(
+            rest,
+            key=lambda p: (-(p["salience"] if "salience" in p else PDFParser.score_page(p["text"])), p["page_number"])
+        )
+
+        chosen = {first["page_number"]: first["text"][:budget_chars]}
+        remaining = budget_chars - len(chosen[first["page_number"]])
+
+        for page in ranked:
+            if remaining <= len(separator):
+                break
+
+            text = page["text"]
+            room = remaining - len(separator)
+
+            if len(text) > room:
+                # Only clip a page when a useful part of it still fits
+                if room < 400:
+                    continue
+                text = text[:room]
+
+            chosen[page["page_number"]] = text
+            remaining -= len(text) + len(separator)
+
+        return separator.join(chosen[number] for number in sorted(chosen))
+
+    @staticmethod
+    def chunk_pages(pages: List[Dict[str, Any]], max_chars: int, max_chunks: Optional[int] = None) -> List[str]:
+        """
+        Pack page texts in deck order into chunks of at most max_chars
+        Pages never straddle chunks unless a single page is longer than max_chars
+        """
+        separator = "\n\n"
+        chunks: List[str] = []
+        current: List[str] = []
+        size = 0
+
+        for page in pages:
+            text = page.get("text") or ""
+
+            for start in range(0, len(text), max_chars):
+                piece = text[start:start + max_chars]
+                added = len(piece) + (len(separator) if current else 0)
+
+                if current and size + added > max_chars:
+                    chunks.append(separator.join(current))
+                    current, size = [], 0
+                    added = len(piece)
+
+                current.append(piece)
+                size += added
+
+        if current:
+            chunks.append(separator.join(current))
+
+        return chunks[:max_chunks] if max_chunks else chunks
+
     @staticmethod
-    def extract_text_pymupdf(pdf_path: str) -> Dict[str, Any]:
+    def extract_text_pymupdf(
+        source: PDFSource,
+        max_chars: Optional[int] = None,
+        detect_tables: bool = True
+    ) -> Dict[str, Any]:
         """
         Extract text from PDF using PyMuPDF
+        max_chars: stop after the page that reaches this many characters (None = every page)
+        detect_tables: flag pages that look tabular (table_candidate)
         Returns structured JSON with page-wise chunks
         """
         try:
-            doc = fitz.open(pdf_path)
+            doc = PDFParser.open_pymupdf(source)
             pages_data = []
+            char_count = 0
 
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()
-
-                # Extract images info
-                images = page.get_images()
+            try:
+                total_pages = len(doc)
 
-                pages_data.append({
-                    "page_number": page_num + 1,
-                    "text": text.strip(),
-                    "image_count": len(images)
-                })
+                for page_data in PDFParser.iter_pages(doc, detect_tables):
+                    pages_data.append(page_data)
+                    char_count += len(page_data["text"])
 
-            doc.close()
+                    if max_chars is not None and char_count >= max_chars:
+                        break
+            finally:
+                doc.close()
 
             # Combine all text
             full_text = "\n\n".join([p["text"] for p in pages_data if p["text"]])
@@ -40,7 +232,9 @@ class PDFParser:
                 "success": True,
                 "pages": pages_data,
                 "full_text": full_text,
-                "total_pages": len(pages_data),
+                "total_pages": total_pages,
+                "pages_scanned": len(pages_data),
+                "truncated": len(pages_data) < total_pages,
                 "method": "pymupdf"
             }
 
@@ -53,20 +247,95 @@ class PDFParser:
             }
 
     @staticmethod
-    def extract_tables_pdfplumber(pdf_path: str) -> Dict[str, Any]:
+    def looks_tabular(page, text: str) -> bool:
+        """
+        Cheap check on a PyMuPDF page for table-like content
+        Either enough ruling lines / cell rectangles, or many short number-heavy lines
+        """
+        lines = [line.split() for line in text.splitlines() if line.strip()]
+        numeric_lines = sum(
+            1 for tokens in lines
+            if len(tokens) <= 8 and sum(1 for t in tokens if NUMERIC_TOKEN.match(t)) * 2 >= len(tokens)
+        )
+
+        if numeric_lines >= TABLE_MIN_ROWS and numeric_lines >= TABLE_NUMERIC_LINE_RATIO * len(lines):
+            return True
+
+        rulings = 0
+        for drawing in page.get_drawings():
+            for item in drawing.get("items", []):
+                if item[0] == "re":
+                    rulings += 1
+                elif item[0] == "l":
+                    start, end = item[1], item[2]
+                    if abs(start.x - end.x) < 1 or abs(start.y - end.y) < 1:
+                        rulings += 1
+
+                if rulings >= TABLE_MIN_RULINGS:
+                    return True
+
+        return False
+
+    @staticmethod
+    def extract_tables(source: PDFSource, pages: Optional[List[int]] = None, engine: str = PDF_TABLE_ENGINE) -> Dict[str, Any]:
+        """
+        On-demand table extraction
+        pages: 1-based page numbers to scan (None = every page)
+        """
+        if engine == "pymupdf":
+            return PDFParser.extract_tables_pymupdf(source, pages)
+        return PDFParser.extract_tables_pdfplumber(source, pages)
+
+    @staticmethod
+    def extract_tables_pymupdf(source: PDFSource, pages: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Extract tables with PyMuPDF's own table finder
+        """
+        try:
+            tables_data = []
+
+            doc = PDFParser.open_pymupdf(source)
+            try:
+                for page_number in pages or range(1, len(doc) + 1):
+                    for table in doc[page_number - 1].find_tables().tables:
+                        tables_data.append({
+                            "page": page_number,
+                            "data": table.extract()
+                        })
+            finally:
+                doc.close()
+
+            return {
+                "success": True,
+                "tables": tables_data,
+                "table_count": len(tables_data),
+                "method": "pymupdf"
+            }
+
+        except Exception as e:
+            logger.error(f"PyMuPDF table extraction failed: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "method": "pymupdf"
+            }
+
+    @staticmethod
+    def extract_tables_pdfplumber(source: PDFSource, pages: Optional[List[int]] = None) -> Dict[str, Any]:
         """
         Extract tables from PDF using pdfplumber
         """
         try:
             tables_data = []
 
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
+            # pdfplumber only loads the requested pages
+            with PDFParser.open_pdfplumber(source, pages) as pdf:
+                for page in pdf.pages:
                     tables = page.extract_tables()
                     if tables:
                         for table in tables:
                             tables_data.append({
-                                "page": page_num + 1,
+                                "page": page.page_number,
                                 "data": table
                             })
 
@@ -86,17 +355,24 @@ class PDFParser:
             }
 
     @staticmethod
-    def parse_pdf(pdf_path: str) -> Dict[str, Any]:
+    def parse_pdf(
+        source: PDFSource,
+        table_mode: str = PDF_TABLE_MODE,
+        table_engine: str = PDF_TABLE_ENGINE,
+        max_chars: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Main parsing function - combines text and table extraction
+        Accepts a file path or the PDF bytes (bytes/bytearray/memoryview)
+        table_mode: auto (pages flagged by the text pass) | all | none
+        max_chars: stop reading pages once this much text is collected (None = full extraction)
         Returns structured JSON ready for AI processing
         """
         try:
-            # Extract text
-            text_result = PDFParser.extract_text_pymupdf(pdf_path)
+            buffer = PDFParser.as_buffer(source)
 
-            # Extract tables
-            table_result = PDFParser.extract_tables_pdfplumber(pdf_path)
+            # Extract text (in auto mode also flags pages that look tabular)
+            text_result = PDFParser.extract_text_pymupdf(buffer, max_chars, detect_tables=table_mode == "auto")
 
             if not text_result.get("success"):
                 return {
@@ -104,13 +380,30 @@ class PDFParser:
                     "error": text_result.get("error", "Unknown error in text extraction")
                 }
 
+            # Extract tables only where needed - the slowest step of the parse
+            if table_mode == "all":
+                table_pages = None
+                if text_result.get("truncated"):
+                    table_pages = [p["page_number"] for p in text_result.get("pages", [])]
+            elif table_mode == "none":
+                table_pages = []
+            else:
+                table_pages = [p["page_number"] for p in text_result.get("pages", []) if p.get("table_candidate")]
+
+            if table_pages == []:
+                table_result = {"success": True, "tables": [], "table_count": 0, "method": "skipped"}
+            else:
+                table_result = PDFParser.extract_tables(buffer, table_pages, table_engine)
+
             return {
                 "success": True,
                 "text_data": text_result,
                 "table_data": table_result,
                 "full_text": text_result.get("full_text", ""),
                 "pages": text_result.get("pages", []),
-                "tables": table_result.get("tables", [])
+                "tables": table_result.get("tables", []),
+                "total_pages": text_result.get("total_pages", 0),
+                "truncated": text_result.get("truncated", False)
             }
 
         except Exception as e:
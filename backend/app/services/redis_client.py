@@ -0,0 +1,30 @@
+import os
+import logging
+import redis.asyncio as redis
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Optional - without REDIS_URL caching and event streaming stay in-process
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Fail fast so an unreachable Redis falls back to in-process paths instead of stalling requests
+REDIS_CONNECT_TIMEOUT_SECONDS = float(os.getenv("REDIS_CONNECT_TIMEOUT_SECONDS", "0.5"))
+REDIS_SOCKET_TIMEOUT_SECONDS = float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "1"))
+REDIS_HEALTH_CHECK_INTERVAL_SECONDS = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL_SECONDS", "15"))
+
+_redis: Optional[redis.Redis] = None
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """Shared async Redis client, or None when REDIS_URL is not configured"""
+    global _redis
+
+    if _redis is None and REDIS_URL:
+        _redis = redis.from_url(
+            REDIS_URL,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT_SECONDS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL_SECONDS
+        )
+
+    return _redis
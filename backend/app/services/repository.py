@@ -0,0 +1,314 @@
+"""
+Async data-access layer
+
+The supabase client is synchronous - every .execute() is a blocking HTTP call.
+All database and storage access goes through this module, which runs the calls
+on a bounded thread pool so the event loop keeps serving requests and agents.
+"""
+
+import asyncio
+import os
+import logging
+import httpx
+from postgrest.exceptions import APIError
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Dict, Any, List, Optional, Callable
+from app.services.supabase_client import get_supabase_client, SUPABASE_URL, SUPABASE_KEY
+
+logger = logging.getLogger(__name__)
+
+# Max concurrent Supabase calls in flight per process
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "16"))
+
+STORAGE_BUCKET = "pitch-decks"
+
+_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="supabase")
+
+supabase = get_supabase_client()
+
+
+async def run_sync(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking call on the database thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+async def execute(query) -> Any:
+    """Execute a postgrest query builder off the event loop"""
+    return await run_sync(query.execute)
+
+
+def is_row_error(error: Exception) -> bool:
+    """
+    True when PostgREST rejected the request because of the rows themselves -
+    SQLSTATE class 22 (bad value) or 23 (constraint violation) - rather than the
+    database or the network being unavailable
+    """
+    code = str(getattr(error, "code", "") or "")
+    return isinstance(error, APIError) and code[:2] in ("22", "23")
+
+
+# Jobs
+
+async def get_job(job_id: str, columns: str = "*") -> Optional[Dict[str, Any]]:
+    response = await execute(supabase.table("jobs").select(columns).eq("id", job_id))
+    return response.data[0] if response.data else None
+
+
+async def create_job(job_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    response = await execute(supabase.table("jobs").insert(job_data))
+    return response.data[0] if response.data else None
+
+
+async def update_job(job_id: str, data: Dict[str, Any], unless_status: Optional[str] = None):
+    """unless_status: skip the update if the job is already in this status"""
+    query = supabase.table("jobs").update(data).eq("id", job_id)
+    if unless_status:
+        query = query.neq("status", unless_status)
+    await execute(query)
+
+
+async def find_completed_job(fingerprint: str, created_after: str) -> Optional[Dict[str, Any]]:
+    """Newest completed job with this fingerprint created after the given ISO timestamp"""
+    response = await execute(
+        supabase.table("jobs").select("id,status,source_job_id")
+        .eq("fingerprint", fingerprint)
+        .eq("status", "completed")
+        .gte("created_at", created_after)
+        .order("created_at", desc=True)
+        .limit(1)
+    )
+    return response.data[0] if response.data else None
+
+
+# Files
+
+async def insert_files(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Bulk insert file records, returns inserted rows in request order"""
+    response = await execute(supabase.table("files").insert(rows))
+    return response.data or []
+
+
+async def get_file(file_id: str, columns: str = "id,upload_status") -> Optional[Dict[str, Any]]:
+    response = await execute(supabase.table("files").select(columns).eq("id", file_id))
+    return response.data[0] if response.data else None
+
+
+async def list_files(job_id: str, columns: str = "id,job_id,file_type,original_name,storage_path,upload_status,content_hash") -> List[Dict[str, Any]]:
+    """Files of a job - the bulky parsed column is left out unless asked for"""
+    response = await execute(supabase.table("files").select(columns).eq("job_id", job_id))
+    return response.data or []
+
+
+async def update_file(file_id: str, data: Dict[str, Any]):
+    await execute(supabase.table("files").update(data).eq("id", file_id))
+
+
+# Startups
+
+async def insert_startups(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert one or many startups, returns inserted rows in request order"""
+    response = await execute(supabase.table("startups").insert(rows))
+    return response.data or []
+
+
+async def upsert_startups(rows: List[Dict[str, Any]]):
+    """Bulk update startups by id - only the columns present in rows are written"""
+    await execute(supabase.table("startups").upsert(rows, on_conflict="id"))
+
+
+async def get_startup(startup_id: str, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    query = supabase.table("startups").select("*").eq("id", startup_id)
+    if job_id:
+        query = query.eq("job_id", job_id)
+    response = await execute(query)
+    return response.data[0] if response.data else None
+
+
+async def list_scored_startups(
+    job_id: str,
+    columns: str = "*",
+    limit: int = 50,
+    after: Optional[tuple] = None
+) -> List[Dict[str, Any]]:
+    """
+    One page of a job's scored startups ranked by relevance_score DESC, id DESC
+    Keyset pagination - after is the validated (relevance_score, id) of the previous page's
+    last row (see decode_cursor).
+    Served by the (job_id, relevance_score DESC, id DESC) index
+    """
+    query = supabase.table("startups").select(columns) \
+        .eq("job_id", job_id) \
+        .not_.is_("relevance_score", "null")
+
+    if after:
+        score, startup_id = after
+        query = query.or_(
+            f"relevance_score.lt.{float(score)},and(relevance_score.eq.{float(score)},id.lt.{startup_id})"
+        )
+
+    query = query.order("relevance_score", desc=True).order("id", desc=True).limit(limit)
+
+    response = await execute(query)
+    return response.data or []
+
+
+# Due diligence
+
+async def insert_due_diligence(dd_entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    response = await execute(supabase.table("due_diligence").insert(dd_entry))
+    return response.data[0] if response.data else None
+
+
+async def get_due_diligence(startup_id: str) -> Optional[Dict[str, Any]]:
+    response = await execute(supabase.table("due_diligence").select("*").eq("startup_id", startup_id))
+    return response.data[0] if response.data else None
+
+
+# Results
+
+async def insert_results(result_entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    response = await execute(supabase.table("results").insert(result_entry))
+    return response.data[0] if response.data else None
+
+
+# Document cache
+
+async def get_document_cache(cache_key: str) -> Optional[Dict[str, Any]]:
+    response = await execute(supabase.table("document_cache").select("*").eq("cache_key", cache_key))
+    return response.data[0] if response.data else None
+
+
+async def upsert_document_cache(entry: Dict[str, Any]):
+    await execute(supabase.table("document_cache").upsert(entry, on_conflict="cache_key"))
+
+
+# Result graph
+
+async def get_job_with_results(job_id: str, columns: str = "*") -> Optional[Dict[str, Any]]:
+    """
+    Job row with its results row embedded under "results" (None if not written yet)
+    One round trip via the results.job_id foreign key
+    """
+    response = await execute(supabase.table("jobs").select(f"{columns}, results(*)").eq("id", job_id))
+
+    if not response.data:
+        return None
+
+    job = response.data[0]
+    embedded = job.pop("results", None) or []
+    if isinstance(embedded, dict):
+        embedded = [embedded]
+    job["results"] = embedded[0] if embedded else None
+    return job
+
+
+async def get_result_graph(job_id: str, job: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load a job's complete result graph in two round trips:
+    job + results, then every ranked startup with its due diligence embedded
+    job: the row from get_job_with_results if the caller already has it (saves the first round trip)
+
+    Returns None if the job does not exist, otherwise
+    {"job": {...}, "results": {...} | None, "startups": [{rank, startup, due_diligence, fit_reason}]}
+    """
+    if job is None:
+        job = await get_job_with_results(job_id)
+
+    if not job:
+        return None
+
+    results = job.pop("results")
+    graph = {"job": job, "results": results, "startups": []}
+
+    top_startups = (results or {}).get("top_startups") or []
+    startup_ids = [info.get("startup_id") for info in top_startups if info.get("startup_id")]
+
+    if not startup_ids:
+        return graph
+
+    response = await execute(
+        supabase.table("startups").select("*, due_diligence(*)").in_("id", startup_ids)
+    )
+
+    startups_by_id = {}
+    for startup in response.data or []:
+        dd_rows = startup.pop("due_diligence", None) or []
+        if isinstance(dd_rows, dict):
+            dd_rows = [dd_rows]
+        startups_by_id[startup.get("id")] = (startup, dd_rows[0] if dd_rows else None)
+
+    # Keep the ranking order from results.top_startups
+    for info in top_startups:
+        startup, dd = startups_by_id.get(info.get("startup_id"), (None, None))
+
+        if startup and dd:
+            graph["startups"].append({
+                "rank": info.get("rank"),
+                "startup": startup,
+                "due_diligence": dd,
+                "fit_reason": info.get("fit_reason")
+            })
+
+    return graph
+
+
+# Storage
+
+async def upload_file(
+    path: str,
+    content: bytes,
+    content_type: Optional[str] = None,
+    bucket: str = STORAGE_BUCKET,
+    upsert: bool = False
+):
+    file_options = {"content-type": content_type or "application/octet-stream"}
+    if upsert:
+        file_options["upsert"] = "true"
+
+    await run_sync(
+        supabase.storage.from_(bucket).upload,
+        path=path,
+        file=content,
+        file_options=file_options
+    )
+
+
+_storage_http: Optional[httpx.AsyncClient] = None
+
+async def upload_stream(
+    path: str,
+    chunks: AsyncIterator[bytes],
+    size: int,
+    content_type: Optional[str] = None,
+    bucket: str = STORAGE_BUCKET
+):
+    """
+    Stream an upload to Supabase Storage chunk by chunk
+    The sync storage client needs the whole body in memory, so this goes to the
+    storage REST endpoint directly with an async body and an explicit Content-Length
+    """
+    global _storage_http
+
+    if _storage_http is None:
+        _storage_http = httpx.AsyncClient(timeout=httpx.Timeout(30.0, write=300.0))
+
+    response = await _storage_http.post(
+        f"{SUPABASE_URL.rstrip('/')}/storage/v1/object/{bucket}/{path}",
+        content=chunks,
+        headers={
+            "Authorization": f"Bearer {SUPABASE_KEY}",
+            "apikey": SUPABASE_KEY,
+            "Content-Type": content_type or "application/octet-stream",
+            "Content-Length": str(size),
+            "x-upsert": "false"
+        }
+    )
+
+    if response.status_code >= 400:
+        raise RuntimeError(f"Storage upload failed for {path}: {response.status_code} {response.text}")
+
+
+async def download_file(path: str, bucket: str = STORAGE_BUCKET) -> bytes:
+    return await run_sync(supabase.storage.from_(bucket).download, path)
@@ -0,0 +1,79 @@
+import gzip
+import json
+import logging
+from typing import Dict, Any, List, Optional
+from storage3.utils import StorageException
+from app.services import repository
+
+logger = logging.getLogger(__name__)
+
+
+class ResultSnapshot:
+    """
+    Immutable, denormalised results document for a finished job
+    Written once at finalize time as gzipped JSON in storage, so completed-job
+    reads are a single key lookup instead of a four-table assembly
+    """
+
+    @staticmethod
+    def storage_path(job_id: str) -> str:
+        return f"{job_id}/results-snapshot.json.gz"
+
+    @staticmethod
+    def build(job_id: str, ranked_startups: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Same shape as the GET /jobs/{job_id}/results response"""
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "startups": ranked_startups
+        }
+
+    @staticmethod
+    def encode(document: Dict[str, Any]) -> bytes:
+        body = json.dumps(document, separators=(",", ":"), default=str).encode("utf-8")
+        return gzip.compress(body, compresslevel=6)
+
+    @staticmethod
+    def decode(data: bytes) -> Dict[str, Any]:
+        return json.loads(gzip.decompress(data))
+
+    @staticmethod
+    async def save(job_id: str, document: Dict[str, Any]) -> Optional[str]:
+        """Upload the compressed snapshot, returns its storage path or None on failure"""
+        path = ResultSnapshot.storage_path(job_id)
+
+        try:
+            await repository.upload_file(path, ResultSnapshot.encode(document), "application/gzip")
+            return path
+        except Exception as e:
+            logger.error(f"Failed to write results snapshot for job {job_id}: {str(e)}")
+            return None
+
+    @staticmethod
+    def is_not_found(error: Exception) -> bool:
+        """Storage reports a missing object as 404, or as 400 with a not_found body"""
+        detail = error.args[0] if isinstance(error, StorageException) and error.args else None
+        if not isinstance(detail, dict):
+            return False
+        return str(detail.get("statusCode")) == "404" or detail.get("error") == "not_found"
+
+    @staticmethod
+    async def load_compressed(path: str) -> Optional[bytes]:
+        """
+        Gzipped snapshot bytes from results.snapshot_path, or None if the object is missing
+        Any other storage failure is logged and also returns None - callers fall back to
+        assembling the result graph
+        """
+        try:
+            return await repository.download_file(path)
+        except Exception as e:
+            if ResultSnapshot.is_not_found(e):
+                logger.warning(f"Results snapshot {path} is missing")
+            else:
+                logger.error(f"Failed to read results snapshot {path}: {str(e)}")
+            return None
+
+    @staticmethod
+    async def load(path: str) -> Optional[Dict[str, Any]]:
+        data = await ResultSnapshot.load_compressed(path)
+        return ResultSnapshot.decode(data) if data else None
@@ -1,49 +1,19 @@
+import csv
 import httpx
+import hashlib
 import logging
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Optional
 import re
+from app.services.column_mapper import ColumnMapper
 
 logger = logging.getLogger(__name__)
 
 class GoogleSheetsParser:
     """
     Parse Google Sheets without API - uses CSV export
-    Flexible column mapping - handles various naming conventions
+    Flexible column mapping via ColumnMapper - handles various naming conventions
     """
 
-    # Column name variations (lowercase for matching)
-    COLUMN_MAPPINGS = {
-        "name": ["name", "company", "startup", "company name", "startup name", "business name"],
-        "sector": ["sector", "industry", "vertical", "category", "domain", "market"],
-        "stage": ["stage", "funding stage", "round", "series", "investment stage"],
-        "geography": ["geography", "location", "region", "country", "city", "market", "geo"],
-        "ticket_size": ["ticket_size", "ticket size", "funding", "investment", "amount", "raise", "capital"],
-        "summary": ["summary", "description", "about", "overview", "pitch", "brief"],
-        "website": ["website", "url", "link", "web", "site"],
-        "pdf_link": ["pdf_link", "pdf link", "deck", "pitch deck", "pdf", "document"],
-        "team": ["team", "founders", "founder", "ceo", "leadership"],
-        "traction": ["traction", "metrics", "revenue", "users", "growth", "customers"],
-        "product": ["product", "solution", "service", "offering", "what we do"]
-    }
-
-    @staticmethod
-    def find_header_index(headers: list, field_name: str) -> int:
-        """Find the index of best matching header"""
-        possible_names = GoogleSheetsParser.COLUMN_MAPPINGS.get(field_name, [field_name])
-
-        # Try exact match first
-        for i, header in enumerate(headers):
-            if header in possible_names:
-                return i
-
-        # Try partial match
-        for i, header in enumerate(headers):
-            for possible in possible_names:
-                if possible in header or header in possible:
-                    return i
-
-        return -1
-
     @staticmethod
     def extract_sheet_id(sheet_url: str) -> str:
         """Extract Google Sheet ID from URL"""
@@ -53,6 +23,78 @@ class GoogleSheetsParser:
             return match.group(1)
         return None
 
+    @staticmethod
+    def get_csv_export_url(sheet_id: str) -> str:
+        """Build the public CSV export URL for a sheet"""
+        return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
+
+    @staticmethod
+    async def fetch_sheet_content_hash(sheet_url: str) -> Optional[str]:
+        """
+        SHA-256 of the sheet's current CSV export, hashed chunk by chunk as it streams in
+        Returns None if the sheet cannot be fetched
+        """
+        try:
+            sheet_id = GoogleSheetsParser.extract_sheet_id(sheet_url)
+
+            if not sheet_id:
+                return None
+
+            digest = hashlib.sha256()
+
+            async with httpx.AsyncClient(follow_redirects=True) as client:
+                async with client.stream("GET", GoogleSheetsParser.get_csv_export_url(sheet_id), timeout=30.0) as response:
+                    if response.status_code != 200:
+                        logger.warning(f"Failed to fetch sheet for hashing: {response.status_code}")
+                        return None
+
+                    async for chunk in response.aiter_bytes():
+                        digest.update(chunk)
+
+            return digest.hexdigest()
+
+        except Exception as e:
+            logger.warning(f"Sheet hashing error: {str(e)}")
+            return None
+
+    @staticmethod
+    async def iter_csv_batches(chunks: AsyncIterator[str]) -> AsyncIterator[List[List[str]]]:
+        """
+        Turn streamed CSV text into batches of parsed rows
+        Lines are buffered until their quote count is even, so a batch never ends
+        inside a quoted field (cells may contain commas, quotes and newlines);
+        each batch is then parsed by the C csv reader
+        """
+        pending: List[str] = []  # pieces of a line not yet terminated
+        record: List[str] = []   # lines of a record still inside quotes
+        quotes = 0
+
+        async for chunk in chunks:
+            if "\n" not in chunk:
+                pending.append(chunk)
+                continue
+
+            lines = chunk.split("\n")
+            lines[0] = "".join(pending) + lines[0]
+            pending = [lines.pop()]
+
+            complete: List[str] = []
+            for line in lines:
+                record.append(line + "\n")
+                quotes += line.count('"')
+
+                if quotes % 2 == 0:
+                    complete.extend(record)
+                    record = []
+                    quotes = 0
+
+            if complete:
+                yield list(csv.reader(complete))
+
+        tail = record + ["".join(pending)]
+        if any(tail):
+            yield list(csv.reader(tail))
+
     @staticmethod
     async def parse_sheet(sheet_url: str) -> Dict[str, Any]:
         """
@@ -72,89 +114,55 @@ class GoogleSheetsParser:
                 }
 
             # Convert to CSV export URL
-            csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
+            csv_url = GoogleSheetsParser.get_csv_export_url(sheet_id)
 
-            # Fetch CSV
-            async with httpx.AsyncClient() as client:
-                response = await client.get(csv_url, timeout=30.0)
-
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "error": f"Failed to fetch sheet: {response.status_code}"
-                    }
-
-                csv_content = response.text
-
-            # Parse CSV
-            rows = csv_content.strip().split('\n')
+            fields = ColumnMapper.FIELDS
+            header_map = None
+            startups = []
 
-            if len(rows) < 2:
+            # Stream the export straight into the csv module, one batch of complete records at a time
+            async with httpx.AsyncClient(follow_redirects=True) as client:
+                async with client.stream("GET", csv_url, timeout=30.0) as response:
+                    if response.status_code != 200:
+                        return {
+                            "success": False,
+                            "error": f"Failed to fetch sheet: {response.status_code}"
+                        }
+
+                    async for rows in GoogleSheetsParser.iter_csv_batches(response.aiter_text()):
+                        for values in rows:
+                            # Blank lines carry no data (exports often start with some)
+                            if not any(v.strip() for v in values):
+                                continue
+
+                            if header_map is None:
+                                # Map headers (first non-blank row) to field indices
+                                header_map = ColumnMapper.map_headers(values)
+
+                                logger.info(f"Header mapping: {header_map}")
+                                continue
+
+                            # Extract startup data using mapped indices
+                            startup = {
+                                field: values[header_map[field]].strip()
+                                if field in header_map and header_map[field] < len(values) else ""
+                                for field in fields
+                            }
+
+                            # Parse ticket size if present
+                            if startup["ticket_size"]:
+                                startup["parsed_ticket_size"] = GoogleSheetsParser.parse_ticket_size(
+                                    startup["ticket_size"]
+                                )
+
+                            startups.append(startup)
+
+            if header_map is None or not startups:
                 return {
                     "success": False,
                     "error": "Sheet is empty or has no data rows"
                 }
 
-            # Get headers (first row)
-            headers = [h.strip().lower() for h in rows[0].split(',')]
-
-            # Map headers to field indices
-            header_map = {}
-            for field in ["name", "sector", "stage", "geography", "ticket_size", "summary",
-                         "website", "pdf_link", "team", "traction", "product"]:
-                idx = GoogleSheetsParser.find_header_index(headers, field)
-                if idx != -1:
-                    header_map[field] = idx
-
-            logger.info(f"Header mapping: {header_map}")
-
-            # Parse data rows
-            startups = []
-            for i, row in enumerate(rows[1:], start=2):
-                try:
-                    # Simple CSV parsing (handles quoted fields)
-                    values = []
-                    current_value = ""
-                    in_quotes = False
-
-                    for char in row:
-                        if char == '"':
-                            in_quotes = not in_quotes
-                        elif char == ',' and not in_quotes:
-                            values.append(current_value.strip())
-                            current_value = ""
-                        else:
-                            current_value += char
-
-                    values.append(current_value.strip())
-
-                    # Extract startup data using mapped indices
-                    startup = {
-                        "name": values[header_map["name"]] if "name" in header_map and header_map["name"] < len(values) else "",
-                        "sector": values[header_map["sector"]] if "sector" in header_map and header_map["sector"] < len(values) else "",
-                        "stage": values[header_map["stage"]] if "stage" in header_map and header_map["stage"] < len(values) else "",
-                        "geography": values[header_map["geography"]] if "geography" in header_map and header_map["geography"] < len(values) else "",
-                        "ticket_size": values[header_map["ticket_size"]] if "ticket_size" in header_map and header_map["ticket_size"] < len(values) else "",
-                        "summary": values[header_map["summary"]] if "summary" in header_map and header_map["summary"] < len(values) else "",
-                        "website": values[header_map["website"]] if "website" in header_map and header_map["website"] < len(values) else "",
-                        "pdf_link": values[header_map["pdf_link"]] if "pdf_link" in header_map and header_map["pdf_link"] < len(values) else "",
-                        "team": values[header_map["team"]] if "team" in header_map and header_map["team"] < len(values) else "",
-                        "traction": values[header_map["traction"]] if "traction" in header_map and header_map["traction"] < len(values) else "",
-                        "product": values[header_map["product"]] if "product" in header_map and header_map["product"] < len(values) else ""
-                    }
-
-                    # Parse ticket size if present
-                    if startup["ticket_size"]:
-                        startup["parsed_ticket_size"] = GoogleSheetsParser.parse_ticket_size(
-                            startup["ticket_size"]
-                        )
-
-                    startups.append(startup)
-
-                except Exception as e:
-                    logger.warning(f"Failed to parse row {i}: {str(e)}")
-                    continue
-
             return {
                 "success": True,
                 "startups": startups,
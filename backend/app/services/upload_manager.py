@@ -0,0 +1,113 @@
+import asyncio
+import io
+import logging
+import os
+from typing import Dict, Any, Optional, Set
+from fastapi import UploadFile
+from app.services import repository
+from app.services.upload_scanner import UploadScanner
+
+logger = logging.getLogger(__name__)
+
+# Storage uploads running at once across all requests in this process
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "4"))
+
+# How long the worker waits for a file upload, and how often it re-checks the DB
+# when the upload is owned by another process
+FILE_READY_TIMEOUT_SECONDS = float(os.getenv("FILE_READY_TIMEOUT_SECONDS", "600"))
+FILE_READY_POLL_INTERVAL_SECONDS = float(os.getenv("FILE_READY_POLL_INTERVAL_SECONDS", "1"))
+
+
+class UploadManager:
+    """
+    Background storage uploads that outlive the create_job request
+    Files are registered as pending, uploaded with bounded concurrency and
+    marked ready/failed; the worker waits on per-file readiness
+    """
+
+    def __init__(self, concurrency: int = UPLOAD_CONCURRENCY):
+        self.concurrency = concurrency
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.ready: Dict[str, asyncio.Future] = {}
+        self.tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def detach(upload: UploadFile) -> UploadFile:
+        """
+        Take ownership of an upload's spooled file
+        FastAPI closes request files before background work runs, so the
+        original UploadFile gets an empty buffer and the copy keeps the data
+        """
+        detached = UploadFile(upload.file, size=upload.size, filename=upload.filename, headers=upload.headers)
+        upload.file = io.BytesIO()
+        return detached
+
+    def start(self, file_id: str, path: str, upload: UploadFile, size: int, content_type: Optional[str] = None):
+        """Schedule the upload of a detached file registered as pending"""
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+
+        self.ready[file_id] = asyncio.get_running_loop().create_future()
+
+        task = asyncio.create_task(self._upload(file_id, path, upload, size, content_type))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _upload(self, file_id: str, path: str, upload: UploadFile, size: int, content_type: Optional[str]):
+        status = "failed"
+
+        try:
+            async with self.semaphore:
+                await repository.upload_stream(path, UploadScanner.iter_chunks(upload), size, content_type)
+            status = "ready"
+        except Exception as e:
+            logger.error(f"Upload of {path} failed: {str(e)}")
+        finally:
+            await upload.close()
+
+        try:
+            await repository.update_file(file_id, {"upload_status": status})
+        except Exception as e:
+            logger.error(f"Failed to record upload status for file {file_id}: {str(e)}")
+
+        future = self.ready.get(file_id)
+        if future is not None and not future.done():
+            future.set_result(status == "ready")
+            # Drop the result if no worker in this process ever asks for it
+            asyncio.get_running_loop().call_later(FILE_READY_TIMEOUT_SECONDS, self.ready.pop, file_id, None)
+
+    async def wait_ready(self, file_record: Dict[str, Any], timeout: float = FILE_READY_TIMEOUT_SECONDS) -> bool:
+        """True once the file is in storage, False if its upload failed or timed out"""
+        file_id = file_record.get("id")
+        status = file_record.get("upload_status") or "ready"
+
+        if status != "pending":
+            return status == "ready"
+
+        future = self.ready.get(file_id)
+
+        try:
+            if future is not None:
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            return await self._poll(file_id, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out waiting for upload of file {file_id}")
+            return False
+        finally:
+            if future is not None and future.done():
+                self.ready.pop(file_id, None)
+
+    async def _poll(self, file_id: str, timeout: float) -> bool:
+        """Fallback when the upload runs in another process - watch files.upload_status"""
+        async def poll():
+            while True:
+                record = await repository.get_file(file_id)
+                status = (record or {}).get("upload_status")
+                if status != "pending":
+                    return status == "ready"
+                await asyncio.sleep(FILE_READY_POLL_INTERVAL_SECONDS)
+
+        return await asyncio.wait_for(poll(), timeout)
+
+
+upload_manager = UploadManager()
@@ -0,0 +1,116 @@
+import hashlib
+import os
+from typing import AsyncIterator, Dict, Any, Optional
+
+# Upload limits - peak memory per upload is bounded by UPLOAD_CHUNK_SIZE
+MAX_UPLOAD_FILE_BYTES = int(float(os.getenv("MAX_UPLOAD_FILE_MB", "50")) * 1024 * 1024)
+MAX_UPLOAD_REQUEST_BYTES = int(float(os.getenv("MAX_UPLOAD_REQUEST_MB", "200")) * 1024 * 1024)
+MAX_UPLOAD_ARCHIVE_BYTES = int(float(os.getenv("MAX_UPLOAD_ARCHIVE_MB", "200")) * 1024 * 1024)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# extension -> (file_type, accepted leading magic bytes; empty tuple = text format, not sniffed)
+SUPPORTED_UPLOADS = {
+    ".pdf": ("pdf", (b"%PDF",)),
+    ".xlsx": ("excel", (b"PK\x03\x04",)),
+    ".xls": ("excel", (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",)),
+    ".csv": ("csv", ()),
+    ".zip": ("zip", (b"PK\x03\x04",)),
+}
+
+
+class UploadRejected(Exception):
+    """Upload refused before it reaches storage - carries the HTTP status to return"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class UploadScanner:
+    """
+    Validates and streams multipart uploads chunk by chunk
+    Never holds more than UPLOAD_CHUNK_SIZE bytes of a file in memory
+    """
+
+    @staticmethod
+    def detect_file_type(filename: str) -> Optional[str]:
+        """pdf | excel | csv, or None if the extension is not supported"""
+        extension = os.path.splitext((filename or "").lower())[1]
+        supported = SUPPORTED_UPLOADS.get(extension)
+        return supported[0] if supported else None
+
+    @staticmethod
+    def max_file_bytes(file_type: Optional[str]) -> int:
+        return MAX_UPLOAD_ARCHIVE_BYTES if file_type == "zip" else MAX_UPLOAD_FILE_BYTES
+
+    @staticmethod
+    def check_declared(filename: str, declared_size: Optional[int]):
+        """Cheap early rejection on extension and the multipart-declared size, before reading anything"""
+        file_type = UploadScanner.detect_file_type(filename)
+
+        if not file_type:
+            raise UploadRejected(415, f"Unsupported file type: {filename} (allowed: PDF, XLSX, XLS, CSV, ZIP)")
+
+        limit = UploadScanner.max_file_bytes(file_type)
+        if declared_size is not None and declared_size > limit:
+            raise UploadRejected(413, f"{filename} exceeds the {limit // (1024 * 1024)}MB per-file limit")
+
+    @staticmethod
+    async def scan(upload, request_budget: int) -> Dict[str, Any]:
+        """
+        Stream through an UploadFile once: incremental SHA-256, size limits and magic-byte check
+        request_budget is the number of bytes still allowed for this request
+        Leaves the file rewound for the upload stream
+        """
+        filename = upload.filename
+        extension = os.path.splitext(filename.lower())[1]
+        file_type, magic = SUPPORTED_UPLOADS[extension]
+        limit = UploadScanner.max_file_bytes(file_type)
+
+        digest = hashlib.sha256()
+        size = 0
+        first_chunk = True
+
+        await upload.seek(0)
+
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            if first_chunk:
+                if magic and not any(chunk.startswith(m) for m in magic):
+                    raise UploadRejected(415, f"{filename} does not look like a valid {extension[1:].upper()} file")
+                first_chunk = False
+
+            size += len(chunk)
+
+            if size > limit:
+                raise UploadRejected(413, f"{filename} exceeds the {limit // (1024 * 1024)}MB per-file limit")
+            if size > request_budget:
+                raise UploadRejected(413, f"Upload exceeds the {MAX_UPLOAD_REQUEST_BYTES // (1024 * 1024)}MB per-request limit")
+
+            digest.update(chunk)
+
+        if size == 0:
+            raise UploadRejected(422, f"{filename} is empty")
+
+        await upload.seek(0)
+
+        return {
+            "sha256": digest.hexdigest(),
+            "size": size,
+            "file_type": file_type
+        }
+
+    @staticmethod
+    async def iter_chunks(upload) -> AsyncIterator[bytes]:
+        """Yield the upload in UPLOAD_CHUNK_SIZE pieces"""
+        await upload.seek(0)
+
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sampling interval and the lag above which a warning is logged
+LOOP_LAG_INTERVAL_MS = int(os.getenv("LOOP_LAG_INTERVAL_MS", "500"))
+LOOP_LAG_WARN_MS = int(os.getenv("LOOP_LAG_WARN_MS", "200"))
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop responsiveness
+    A task sleeps for a fixed interval - any extra delay before it wakes up is time
+    the loop spent blocked on something else (sync I/O, CPU-bound parsing, ...)
+    """
+
+    def __init__(self, interval_ms: int = LOOP_LAG_INTERVAL_MS, window: int = 120):
+        self.interval = interval_ms / 1000
+        self.samples = deque(maxlen=window)
+        self.max_lag_ms = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.perf_counter() - started - self.interval) * 1000)
+
+            self.samples.append(lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+            if lag_ms > LOOP_LAG_WARN_MS:
+                logger.warning(f"Event loop blocked for {lag_ms:.0f}ms")
+
+    def stats(self) -> Dict[str, Any]:
+        """Current, p50/p99 over the recent window, and all-time max lag in milliseconds"""
+        if not self.samples:
+            return {"current_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "samples": 0}
+
+        ordered = sorted(self.samples)
+
+        return {
+            "current_ms": round(self.samples[-1], 2),
+            "p50_ms": round(ordered[len(ordered) // 2], 2),
+            "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 2),
+            "max_ms": round(self.max_lag_ms, 2),
+            "samples": len(ordered)
+        }
+
+
+loop_monitor = LoopLagMonitor()
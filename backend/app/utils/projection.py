@@ -0,0 +1,92 @@
+import base64
+import json
+import math
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Columns the API allows clients to project, per table
+JOB_FIELDS = {
+    "id", "created_at", "status", "filters", "user_token", "progress", "error_log", "fingerprint", "source_job_id", "results"
+}
+STARTUP_FIELDS = {
+    "id", "job_id", "source_file_id", "name", "sector", "stage", "geography", "ticket_size_min",
+    "ticket_size_max", "summary", "metadata", "relevance_score", "filter_reasoning", "created_at"
+}
+DUE_DILIGENCE_FIELDS = {
+    "id", "startup_id", "tech_validation", "market_analysis", "competitor_map", "financial_check",
+    "risk_heatmap", "success_rate", "competition_difficulty", "revenue_projection", "profit_margin",
+    "key_points", "overall_summary", "detailed_analysis", "recommendation", "market_score", "created_at"
+}
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], always: Iterable[str] = ("id",)) -> Optional[List[str]]:
+    """
+    Parse a comma separated fields= parameter
+    Returns None when no projection was requested; raises ValueError on unknown fields
+    """
+    if not fields:
+        return None
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    columns = list(always)
+    for field in requested:
+        if field not in columns:
+            columns.append(field)
+
+    return columns
+
+
+def parse_nested_fields(fields: Optional[str], groups: Dict[str, Iterable[str]]) -> Optional[Dict[str, List[str]]]:
+    """
+    Parse dotted fields like "startup.name,due_diligence.success_rate"
+    Returns {group: [columns]} (groups without any requested field keep all columns -> None)
+    """
+    if not fields:
+        return None
+
+    selected: Dict[str, List[str]] = {}
+
+    for field in (f.strip() for f in fields.split(",") if f.strip()):
+        group, _, column = field.partition(".")
+
+        if group not in groups or column not in groups[group]:
+            raise ValueError(f"Unknown field: {field}")
+
+        selected.setdefault(group, ["id"])
+        if column not in selected[group]:
+            selected[group].append(column)
+
+    return selected
+
+
+def project(document: Dict[str, Any], columns: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only the requested keys (no-op when columns is None)"""
+    if columns is None or document is None:
+        return document
+    return {key: document.get(key) for key in columns if key in document}
+
+
+def encode_cursor(values: Tuple[Any, ...]) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    (relevance_score, startup id) from a cursor made by encode_cursor
+    Raises ValueError unless it is exactly a (number, UUID) pair - the values end up in a PostgREST filter
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, startup_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not math.isfinite(score):
+            raise ValueError
+        return float(score), str(uuid.UUID(startup_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
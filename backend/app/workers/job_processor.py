@@ -1,20 +1,52 @@
 import asyncio
+import heapq
+import io
 import logging
-import tempfile
 import os
-from typing import Dict, Any, List
-from app.services.supabase_client import get_supabase_client
-from app.services.pdf_parser import PDFParser
+import zipfile
+from typing import Dict, Any, List, Optional, Tuple
+from app.services import repository
+from app.services.parse_pool import parse_pool
+from app.services.pdf_parser import PDFParser, PDF_TABLE_MODE, PDF_TABLE_ENGINE
 from app.services.sheets_parser import GoogleSheetsParser
 from app.services.excel_parser import ExcelParser
+from app.services.result_snapshot import ResultSnapshot
+from app.services.parsed_store import ParsedStore
+from app.services.document_cache import DocumentCache
+from app.services.archive_reader import ArchiveReader
+from app.services.upload_scanner import UploadRejected
+from app.services.event_bus import event_bus
+from app.services.upload_manager import upload_manager
 from app.agents.agent_parser import ParserAgent
 from app.agents.agent_filter import FilterAgent
 from app.agents.agent_tech import TechAgent
 from app.agents.agent_market import MarketAgent
 from app.agents.agent_risk import RiskAgent
+from app.workers.score_buffer import RelevanceScoreBuffer
+from app.workers.progress_reporter import ProgressReporter
 
 logger = logging.getLogger(__name__)
 
+# Filter stage map-reduce: candidates are split into FILTER_WORKERS shards scored concurrently,
+# each worker runs FILTER_BATCH_SIZE agent calls at a time
+FILTER_WORKERS = int(os.getenv("FILTER_WORKERS", "4"))
+FILTER_BATCH_SIZE = int(os.getenv("FILTER_BATCH_SIZE", "10"))
+
+# Rows per bulk insert when writing parsed Excel/CSV/Sheet startups
+STARTUP_INSERT_CHUNK_SIZE = int(os.getenv("STARTUP_INSERT_CHUNK_SIZE", "500"))
+# Whole-chunk retries (with backoff) when an insert fails for reasons other than its rows
+STARTUP_INSERT_RETRIES = 3
+
+# Deck text read per PDF - page extraction stops once this much is collected (0 = every page)
+# The parser agent gets the best ParserAgent.CONTEXT_CHARS of it, ranked by page salience
+PDF_TEXT_BUDGET_CHARS = int(os.getenv("PDF_TEXT_BUDGET_CHARS", str(ParserAgent.CONTEXT_CHARS * 5)))
+
+# Documents of a ZIP data room parsed at once
+ZIP_PARSE_CONCURRENCY = int(os.getenv("ZIP_PARSE_CONCURRENCY", "8"))
+
+# Number of startups that go through due diligence
+SHORTLIST_SIZE = 5
+
 class JobProcessor:
     """
     Main job processor - orchestrates the entire pipeline
@@ -23,32 +55,21 @@ class JobProcessor:
 
     def __init__(self, job_id: str):
         self.job_id = job_id
-        self.supabase = get_supabase_client()
+        self.filtered_count = 0
+        self.score_buffer = RelevanceScoreBuffer(job_id)
+        self.progress = ProgressReporter(job_id)
+        # Startup rows the database rejected during ingest
+        self.failed_startup_inserts = 0
 
-    async def update_progress(self, step: str, percent: int, message: str):
-        """Update job progress in Supabase"""
-        try:
-            self.supabase.table("jobs").update({
-                "progress": {
-                    "step": step,
-                    "percent": percent,
-                    "status_message": message
-                }
-            }).eq("id", self.job_id).execute()
-            logger.info(f"Job {self.job_id}: {step} - {percent}% - {message}")
-        except Exception as e:
-            logger.error(f"Failed to update progress: {str(e)}")
+    async def update_progress(self, step: str, percent: int, message: str, status: str = None, **fields):
+        """Update job progress (and optionally status) - writes are coalesced by ProgressReporter"""
+        await self.progress.report(step, percent, message, status=status, **fields)
+        logger.info(f"Job {self.job_id}: {step} - {percent}% - {message}")
 
     async def log_error(self, error_message: str):
         """Log error to job"""
-        try:
-            self.supabase.table("jobs").update({
-                "error_log": error_message,
-                "status": "failed"
-            }).eq("id", self.job_id).execute()
-            logger.error(f"Job {self.job_id} failed: {error_message}")
-        except Exception as e:
-            logger.error(f"Failed to log error: {str(e)}")
+        await self.progress.fail(error_message)
+        logger.error(f"Job {self.job_id} failed: {error_message}")
 
     async def process_job(self):
         """
@@ -56,31 +77,32 @@ class JobProcessor:
         """
         try:
             # Get job details
-            job_response = self.supabase.table("jobs").select("*").eq("id", self.job_id).execute()
+            job = await repository.get_job(self.job_id)
 
-            if not job_response.data:
+            if not job:
                 await self.log_error("Job not found")
                 return
 
-            job = job_response.data[0]
             filters = job.get("filters", {})
 
-            # Update status
-            self.supabase.table("jobs").update({"status": "parsing"}).eq("id", self.job_id).execute()
-
             # STEP 1: PARSE FILES
-            await self.update_progress("parsing", 10, "Starting file parsing...")
+            await self.update_progress("parsing", 10, "Starting file parsing...", status="parsing")
             startup_candidates = await self.parse_files()
 
             if not startup_candidates:
                 await self.log_error("No startups extracted from files")
                 return
 
-            await self.update_progress("parsing", 30, f"Parsed {len(startup_candidates)} startups")
+            if self.failed_startup_inserts:
+                await self.update_progress(
+                    "parsing", 30, f"Parsed {len(startup_candidates)} startups",
+                    error_log=f"{self.failed_startup_inserts} startup rows could not be saved and were skipped"
+                )
+            else:
+                await self.update_progress("parsing", 30, f"Parsed {len(startup_candidates)} startups")
 
             # STEP 2: FILTER & RANK
-            await self.update_progress("filtering", 40, "Filtering startups against thesis...")
-            self.supabase.table("jobs").update({"status": "filtering"}).eq("id", self.job_id).execute()
+            await self.update_progress("filtering", 40, "Filtering startups against thesis...", status="filtering")
 
             shortlisted = await self.filter_startups(startup_candidates, filters)
 
@@ -91,8 +113,7 @@ class JobProcessor:
             await self.update_progress("filtering", 50, f"Shortlisted {len(shortlisted)} startups")
 
             # STEP 3: DUE DILIGENCE
-            await self.update_progress("dd_running", 60, "Running due diligence on top startups...")
-            self.supabase.table("jobs").update({"status": "dd_running"}).eq("id", self.job_id).execute()
+            await self.update_progress("dd_running", 60, "Running due diligence on top startups...", status="dd_running")
 
             dd_results = await self.run_due_diligence(shortlisted)
 
@@ -102,14 +123,7 @@ class JobProcessor:
             await self.finalize_results(dd_results)
 
             # Mark complete
-            self.supabase.table("jobs").update({
-                "status": "completed",
-                "progress": {
-                    "step": "completed",
-                    "percent": 100,
-                    "status_message": "Analysis complete!"
-                }
-            }).eq("id", self.job_id).execute()
+            await self.update_progress("completed", 100, "Analysis complete!", status="completed")
 
             logger.info(f"Job {self.job_id} completed successfully")
 
@@ -117,113 +131,249 @@ class JobProcessor:
             logger.exception(f"Job {self.job_id} failed with exception")
             await self.log_error(f"Critical error: {str(e)}")
 
+        finally:
+            # Make sure the last coalesced progress state is written
+            await self.progress.close()
+
     async def parse_files(self) -> List[Dict[str, Any]]:
         """Parse all uploaded files (PDFs and Google Sheets)"""
         try:
             # Get all files for this job
-            files_response = self.supabase.table("files").select("*").eq("job_id", self.job_id).execute()
+            file_records = await repository.list_files(self.job_id)
 
-            if not files_response.data:
+            if not file_records:
                 logger.warning(f"No files found for job {self.job_id}")
                 return []
 
-            startups = []
+            # Files are parsed concurrently - PDF parsing runs in the parser process pool
+            parsed = await asyncio.gather(*[self.parse_file(file_record) for file_record in file_records])
 
-            for file_record in files_response.data:
-                file_type = file_record.get("file_type")
+            return [startup for file_startups in parsed for startup in file_startups]
 
-                if file_type == "pdf":
-                    startup_data = await self.parse_pdf_file(file_record)
-                    if startup_data:
-                        startups.append(startup_data)
+        except Exception as e:
+            logger.error(f"File parsing error: {str(e)}")
+            return []
 
-                elif file_type in ["excel", "csv"]:
-                    excel_startups = await self.parse_excel_file(file_record)
-                    startups.extend(excel_startups)
+    async def parse_file(self, file_record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Parse one file record into its startups"""
+        file_type = file_record.get("file_type")
 
-                elif file_type == "sheet":
-                    sheet_startups = await self.parse_google_sheet(file_record)
-                    startups.extend(sheet_startups)
+        # Uploads finish after the job is enqueued - wait for this file to land in storage
+        if not await upload_manager.wait_ready(file_record):
+            logger.error(f"Skipping {file_record.get('original_name')} - upload did not complete")
+            return []
 
-            return startups
+        if file_type == "pdf":
+            startup_data = await self.parse_pdf_file(file_record)
+            return [startup_data] if startup_data else []
 
-        except Exception as e:
-            logger.error(f"File parsing error: {str(e)}")
-            return []
+        elif file_type in ["excel", "csv"]:
+            return await self.parse_excel_file(file_record)
+
+        elif file_type == "sheet":
+            return await self.parse_google_sheet(file_record)
+
+        elif file_type == "zip":
+            return await self.parse_zip_file(file_record)
+
+        return []
+
+    async def extract_pdf(self, pdf_bytes: bytes, content_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        PDF bytes -> {"parsed": files.parsed document, "data": parser agent fields}
+        Identical decks (same SHA-256) are served from the document cache
+        content_hash: SHA-256 already computed at upload time - only hashed here when missing
+        """
+        if not content_hash:
+            content_hash = await DocumentCache.hash_pdf(pdf_bytes)
+
+        map_reduce = ParserAgent.EXTRACTION_MODE == "map_reduce"
+
+        if map_reduce:
+            # Read as much of the deck as the chunk budget can cover
+            max_chars = ParserAgent.chunk_chars() * ParserAgent.MAX_CHUNKS
+        else:
+            max_chars = PDF_TEXT_BUDGET_CHARS or None
+
+        # Settings that change the parse or the prompt - part of the cache key
+        options = {
+            "table_mode": PDF_TABLE_MODE,
+            "table_engine": PDF_TABLE_ENGINE,
+            "max_chars": max_chars,
+            "context_chars": ParserAgent.CONTEXT_CHARS,
+            "chunk_chars": ParserAgent.chunk_chars() if map_reduce else None
+        }
+
+        cached = await DocumentCache.get(content_hash, options)
+        if cached:
+            logger.info(f"Document cache hit for {content_hash[:12]}")
+            return {"parsed": cached.get("parsed"), "data": cached.get("extracted")}
+
+        pdf_data = await parse_pool.parse_pdf(pdf_bytes, max_chars=max_chars)
+
+        if not pdf_data.get("success"):
+            logger.error(f"PDF parsing failed: {pdf_data.get('error')}")
+            return None
+
+        pages = pdf_data.get("pages", [])
+
+        # Use AI to extract structured data
+        if map_reduce and sum(len(p.get("text", "")) for p in pages) > ParserAgent.CONTEXT_CHARS:
+            parser_result = await ParserAgent.parse_pdf_chunks(
+                PDFParser.chunk_pages(pages, ParserAgent.chunk_chars(), ParserAgent.MAX_CHUNKS),
+                pdf_data
+            )
+        else:
+            parser_result = await ParserAgent.parse_pdf_content(
+                pdf_text=PDFParser.select_context(pages, ParserAgent.CONTEXT_CHARS),
+                pdf_data=pdf_data
+            )
+
+        if not parser_result.get("success"):
+            logger.error(f"Parser agent failed: {parser_result.get('error')}")
+            return None
+
+        parsed = await ParsedStore.save(
+            ParsedStore.compact_pdf_payload(pdf_data),
+            ParsedStore.pdf_summary(pdf_data)
+        )
+        extracted_data = parser_result.get("data", {})
+
+        await DocumentCache.put(content_hash, options, parsed, extracted_data)
+
+        return {"parsed": parsed, "data": extracted_data}
 
     async def parse_pdf_file(self, file_record: Dict[str, Any]) -> Dict[str, Any]:
         """Parse a single PDF file - NO MOCKS!"""
         try:
             storage_path = file_record.get("storage_path")
 
-            # Download PDF from Supabase Storage
-            file_data = self.supabase.storage.from_("pitch-decks").download(storage_path)
-
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                tmp_file.write(file_data)
-                tmp_path = tmp_file.name
+            # Download PDF from Supabase Storage and parse it straight from memory
+            file_data = await repository.download_file(storage_path)
 
-            try:
-                # Parse PDF with PyMuPDF
-                pdf_data = PDFParser.parse_pdf(tmp_path)
+            extraction = await self.extract_pdf(file_data, file_record.get("content_hash"))
 
-                if not pdf_data.get("success"):
-                    logger.error(f"PDF parsing failed: {pdf_data.get('error')}")
-                    return None
+            if not extraction:
+                return None
 
-                # Use AI to extract structured data
-                parser_result = await ParserAgent.parse_pdf_content(
-                    pdf_text=pdf_data.get("full_text", ""),
-                    pdf_data=pdf_data
-                )
+            extracted_data = extraction["data"]
 
-                if not parser_result.get("success"):
-                    logger.error(f"Parser agent failed: {parser_result.get('error')}")
-                    return None
-
-                extracted_data = parser_result.get("data", {})
-
-                # Save parsed data to files table
-                self.supabase.table("files").update({
-                    "parsed": pdf_data
-                }).eq("id", file_record.get("id")).execute()
-
-                # Create startup entry
-                startup_entry = {
-                    "job_id": self.job_id,
-                    "source_file_id": file_record.get("id"),
-                    "name": extracted_data.get("name"),
-                    "sector": extracted_data.get("sector"),
-                    "stage": extracted_data.get("stage"),
-                    "geography": extracted_data.get("geography"),
-                    "ticket_size_min": extracted_data.get("ticket_size_min"),
-                    "ticket_size_max": extracted_data.get("ticket_size_max"),
-                    "summary": extracted_data.get("summary"),
-                    "metadata": {
-                        "team": extracted_data.get("team", []),
-                        "traction": extracted_data.get("traction"),
-                        "product": extracted_data.get("product"),
-                        "claims": extracted_data.get("claims", [])
-                    }
-                }
+            # Save parsed data to files table
+            await repository.update_file(file_record.get("id"), {
+                "parsed": extraction["parsed"]
+            })
 
-                startup_response = self.supabase.table("startups").insert(startup_entry).execute()
+            # Create startup entry
+            startup_entry = self.build_pdf_startup_entry(extracted_data, file_record)
 
-                if startup_response.data:
-                    return startup_response.data[0]
+            inserted = await repository.insert_startups([startup_entry])
 
-                return None
+            if inserted:
+                return inserted[0]
 
-            finally:
-                # Clean up temp file
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
+            return None
 
         except Exception as e:
             logger.error(f"PDF file processing error: {str(e)}")
             return None
 
+    def build_pdf_startup_entry(self, extracted_data: Dict[str, Any], file_record: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a startups row from parser agent output"""
+        return {
+            "job_id": self.job_id,
+            "source_file_id": file_record.get("id"),
+            "name": extracted_data.get("name"),
+            "sector": extracted_data.get("sector"),
+            "stage": extracted_data.get("stage"),
+            "geography": extracted_data.get("geography"),
+            "ticket_size_min": extracted_data.get("ticket_size_min"),
+            "ticket_size_max": extracted_data.get("ticket_size_max"),
+            "summary": extracted_data.get("summary"),
+            "metadata": {
+                "team": extracted_data.get("team", []),
+                "traction": extracted_data.get("traction"),
+                "product": extracted_data.get("product"),
+                "claims": extracted_data.get("claims", [])
+            }
+        }
+
+    def build_row_startup_entry(self, row_data: Dict[str, Any], file_record: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a startups row from a parsed Excel/CSV/Sheet row"""
+        parsed_ticket = row_data.get("parsed_ticket_size", {})
+
+        return {
+            "job_id": self.job_id,
+            "source_file_id": file_record.get("id"),
+            "name": row_data.get("name", ""),
+            "sector": row_data.get("sector", ""),
+            "stage": row_data.get("stage", ""),
+            "geography": row_data.get("geography", ""),
+            "ticket_size_min": parsed_ticket.get("min"),
+            "ticket_size_max": parsed_ticket.get("max"),
+            "summary": row_data.get("summary", ""),
+            "metadata": {
+                "team": row_data.get("team", ""),
+                "traction": row_data.get("traction", ""),
+                "product": row_data.get("product", ""),
+                "website": row_data.get("website", ""),
+                "pdf_link": row_data.get("pdf_link", "")
+            }
+        }
+
+    async def insert_startups(self, startup_entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Bulk insert startup rows in chunks of STARTUP_INSERT_CHUNK_SIZE
+        Returns the inserted rows (with their new ids) in input order
+        """
+        inserted = []
+
+        for i in range(0, len(startup_entries), STARTUP_INSERT_CHUNK_SIZE):
+            inserted.extend(await self.insert_startup_chunk(startup_entries[i:i + STARTUP_INSERT_CHUNK_SIZE]))
+
+        return inserted
+
+    async def insert_startup_chunk(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert one chunk
+        Row-level rejections (bad value, constraint) retry each half until the failing rows
+        are isolated - a bad row only loses itself. Transport/server errors retry the whole
+        chunk with backoff instead, so an outage costs a few calls rather than one per row
+        """
+        for attempt in range(STARTUP_INSERT_RETRIES + 1):
+            try:
+                rows = await repository.insert_startups(chunk)
+                break
+            except Exception as e:
+                if repository.is_row_error(e):
+                    if len(chunk) == 1:
+                        self.failed_startup_inserts += 1
+                        logger.error(f"Failed to insert startup '{chunk[0].get('name')}': {str(e)}")
+                        return []
+
+                    logger.warning(f"Bulk insert of {len(chunk)} startups rejected, splitting: {str(e)}")
+                    middle = len(chunk) // 2
+                    return await self.insert_startup_chunk(chunk[:middle]) + await self.insert_startup_chunk(chunk[middle:])
+
+                if attempt == STARTUP_INSERT_RETRIES:
+                    self.failed_startup_inserts += len(chunk)
+                    logger.error(f"Bulk insert of {len(chunk)} startups failed after {attempt + 1} attempts: {str(e)}")
+                    return []
+
+                delay = 0.5 * 2 ** attempt
+                logger.warning(f"Bulk insert of {len(chunk)} startups failed, retrying in {delay}s: {str(e)}")
+                await asyncio.sleep(delay)
+
+        if len(rows) != len(chunk):
+            logger.warning(f"Bulk insert returned {len(rows)} rows for {len(chunk)} startups")
+
+        # PostgREST returns inserted rows in request order - map ids back onto our rows
+        inserted = []
+        for entry, row in zip(chunk, rows):
+            entry.update(row)
+            inserted.append(entry)
+
+        return inserted
+
     async def parse_excel_file(self, file_record: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Parse Excel/CSV file and extract startups - NO MOCKS!"""
         try:
@@ -231,50 +381,27 @@ class JobProcessor:
             filename = file_record.get("original_name")
 
             # Download file from Supabase Storage
-            file_data = self.supabase.storage.from_("pitch-decks").download(storage_path)
+            file_data = await repository.download_file(storage_path)
 
-            # Parse Excel/CSV
-            excel_result = ExcelParser.parse_excel(file_data, filename)
+            # Parse Excel/CSV - pandas work, keep it off the event loop
+            excel_result = await asyncio.to_thread(ExcelParser.parse_excel, file_data, filename)
 
             if not excel_result.get("success"):
                 logger.error(f"Excel/CSV parsing failed: {excel_result.get('error')}")
                 return []
 
             # Save parsed data to files table
-            self.supabase.table("files").update({
-                "parsed": excel_result
-            }).eq("id", file_record.get("id")).execute()
-
-            startups = []
-            excel_startups = excel_result.get("startups", [])
-
-            for row_data in excel_startups:
-                # Create startup entry from row
-                parsed_ticket = row_data.get("parsed_ticket_size", {})
-
-                startup_entry = {
-                    "job_id": self.job_id,
-                    "source_file_id": file_record.get("id"),
-                    "name": row_data.get("name", ""),
-                    "sector": row_data.get("sector", ""),
-                    "stage": row_data.get("stage", ""),
-                    "geography": row_data.get("geography", ""),
-                    "ticket_size_min": parsed_ticket.get("min"),
-                    "ticket_size_max": parsed_ticket.get("max"),
-                    "summary": row_data.get("summary", ""),
-                    "metadata": {
-                        "team": row_data.get("team", ""),
-                        "traction": row_data.get("traction", ""),
-                        "product": row_data.get("product", ""),
-                        "website": row_data.get("website", ""),
-                        "pdf_link": row_data.get("pdf_link", "")
-                    }
-                }
+            await repository.update_file(file_record.get("id"), {
+                "parsed": await ParsedStore.save(excel_result, ParsedStore.rows_summary(excel_result))
+            })
 
-                startup_response = self.supabase.table("startups").insert(startup_entry).execute()
+            # Build all rows in memory, then write them in chunked bulk inserts
+            startup_entries = [
+                self.build_row_startup_entry(row_data, file_record)
+                for row_data in excel_result.get("startups", [])
+            ]
 
-                if startup_response.data:
-                    startups.append(startup_response.data[0])
+            startups = await self.insert_startups(startup_entries)
 
             logger.info(f"Parsed {len(startups)} startups from Excel/CSV file")
             return startups
@@ -283,6 +410,94 @@ class JobProcessor:
             logger.error(f"Excel/CSV file processing error: {str(e)}")
             return []
 
+    async def parse_zip_entry(
+        self,
+        archive: zipfile.ZipFile,
+        info: zipfile.ZipInfo,
+        file_type: str,
+        file_record: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Startup entries (not yet inserted) for one document inside a data room"""
+        content = await asyncio.to_thread(ArchiveReader.read_entry, archive, info)
+
+        if file_type == "pdf":
+            extraction = await self.extract_pdf(content)
+            if not extraction:
+                return []
+
+            entry = self.build_pdf_startup_entry(extraction["data"], file_record)
+            entry["metadata"]["source_entry"] = info.filename
+            return [entry]
+
+        result = await asyncio.to_thread(ExcelParser.parse_excel, content, info.filename)
+
+        if not result.get("success"):
+            logger.error(f"Excel/CSV parsing failed for {info.filename}: {result.get('error')}")
+            return []
+
+        entries = []
+        for row_data in result.get("startups", []):
+            entry = self.build_row_startup_entry(row_data, file_record)
+            entry["metadata"]["source_entry"] = info.filename
+            entries.append(entry)
+
+        return entries
+
+    async def parse_zip_file(self, file_record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Parse a ZIP data room - entries are decompressed one at a time from memory
+        and dispatched to the PDF / Excel / CSV parsers in parallel
+        """
+        try:
+            file_data = await repository.download_file(file_record.get("storage_path"))
+            archive = zipfile.ZipFile(io.BytesIO(file_data))
+
+            try:
+                documents = ArchiveReader.list_documents(archive)
+            except UploadRejected as e:
+                logger.error(f"Rejected archive {file_record.get('original_name')}: {e.detail}")
+                await repository.update_file(file_record.get("id"), {
+                    "parsed": {"success": False, "error": e.detail}
+                })
+                return []
+
+            semaphore = asyncio.Semaphore(ZIP_PARSE_CONCURRENCY)
+            failed = []
+
+            async def parse_entry(info: zipfile.ZipInfo, file_type: str) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    try:
+                        entries = await self.parse_zip_entry(archive, info, file_type, file_record)
+                    except Exception as e:
+                        logger.error(f"Failed to parse archive entry {info.filename}: {str(e)}")
+                        entries = []
+
+                if not entries:
+                    failed.append(info.filename)
+                return entries
+
+            parsed = await asyncio.gather(*[parse_entry(info, file_type) for info, file_type in documents])
+            startup_entries = [entry for entries in parsed for entry in entries]
+
+            await repository.update_file(file_record.get("id"), {
+                "parsed": {
+                    "success": True,
+                    "entries": len(documents),
+                    "parsed_entries": len(documents) - len(failed),
+                    "failed_entries": sorted(failed)
+                }
+            })
+
+            # Entries keep archive order - written in chunked bulk inserts
+            startups = await self.insert_startups(startup_entries)
+
+            logger.info(f"Parsed {len(startups)} startups from {len(documents)} documents in archive")
+            return startups
+
+        except Exception as e:
+            logger.error(f"ZIP file processing error: {str(e)}")
+            return []
+
     async def parse_google_sheet(self, file_record: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Parse Google Sheet and extract startups - NO MOCKS!"""
         try:
@@ -296,11 +511,11 @@ class JobProcessor:
                 return []
 
             # Save parsed data to files table
-            self.supabase.table("files").update({
-                "parsed": sheet_result
-            }).eq("id", file_record.get("id")).execute()
+            await repository.update_file(file_record.get("id"), {
+                "parsed": await ParsedStore.save(sheet_result, ParsedStore.rows_summary(sheet_result))
+            })
 
-            startups = []
+            startup_entries = []
             sheet_startups = sheet_result.get("startups", [])
 
             for row_data in sheet_startups:
@@ -312,56 +527,17 @@ class JobProcessor:
                     pdf_bytes = await GoogleSheetsParser.download_pdf_from_url(pdf_link)
 
                     if pdf_bytes:
-                        # Save to temp file and parse
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                            tmp_file.write(pdf_bytes)
-                            tmp_path = tmp_file.name
-
-                        try:
-                            pdf_data = PDFParser.parse_pdf(tmp_path)
-
-                            if pdf_data.get("success"):
-                                # Use AI to extract structured data
-                                parser_result = await ParserAgent.parse_pdf_content(
-                                    pdf_text=pdf_data.get("full_text", ""),
-                                    pdf_data=pdf_data
-                                )
-
-                                if parser_result.get("success"):
-                                    extracted_data = parser_result.get("data", {})
-                                    # Merge sheet data with PDF extracted data
-                                    row_data.update(extracted_data)
-
-                        finally:
-                            if os.path.exists(tmp_path):
-                                os.unlink(tmp_path)
+                        extraction = await self.extract_pdf(pdf_bytes)
 
-                # Create startup entry from sheet row
-                parsed_ticket = row_data.get("parsed_ticket_size", {})
-
-                startup_entry = {
-                    "job_id": self.job_id,
-                    "source_file_id": file_record.get("id"),
-                    "name": row_data.get("name", ""),
-                    "sector": row_data.get("sector", ""),
-                    "stage": row_data.get("stage", ""),
-                    "geography": row_data.get("geography", ""),
-                    "ticket_size_min": parsed_ticket.get("min"),
-                    "ticket_size_max": parsed_ticket.get("max"),
-                    "summary": row_data.get("summary", ""),
-                    "metadata": {
-                        "team": row_data.get("team", ""),
-                        "traction": row_data.get("traction", ""),
-                        "product": row_data.get("product", ""),
-                        "website": row_data.get("website", ""),
-                        "pdf_link": row_data.get("pdf_link", "")
-                    }
-                }
+                        if extraction:
+                            # Merge sheet data with PDF extracted data
+                            row_data.update(extraction["data"])
 
-                startup_response = self.supabase.table("startups").insert(startup_entry).execute()
+                # Create startup entry from sheet row
+                startup_entries.append(self.build_row_startup_entry(row_data, file_record))
 
-                if startup_response.data:
-                    startups.append(startup_response.data[0])
+            # Write all rows in chunked bulk inserts
+            startups = await self.insert_startups(startup_entries)
 
             logger.info(f"Parsed {len(startups)} startups from Google Sheet")
             return startups
@@ -370,67 +546,114 @@ class JobProcessor:
             logger.error(f"Google Sheet processing error: {str(e)}")
             return []
 
-    async def filter_startups(self, startups: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Filter startups using AI - OPTIMIZED with parallel batches!"""
-        try:
-            filtered = []
+    @staticmethod
+    def shard_candidates(startups: List[Dict[str, Any]], shard_count: int) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        """Split candidates into contiguous shards as (offset, shard) pairs"""
+        shard_count = max(1, min(shard_count, len(startups)))
+        shard_size = -(-len(startups) // shard_count)  # ceil division
+
+        return [
+            (offset, startups[offset:offset + shard_size])
+            for offset in range(0, len(startups), shard_size)
+        ]
+
+    async def score_shard(
+        self,
+        offset: int,
+        shard: List[Dict[str, Any]],
+        filters: Dict[str, Any],
+        total: int,
+        top_k: int
+    ) -> List[Tuple[float, int, Dict[str, Any]]]:
+        """
+        Map step: score one shard in parallel batches and keep only its local top-K
+        Returns heap entries (score, -position, startup) so ties keep input order
+        """
+        local_top = []
+
+        for i in range(0, len(shard), FILTER_BATCH_SIZE):
+            batch = shard[i:i + FILTER_BATCH_SIZE]
+
+            # Run batch in parallel
+            tasks = [
+                FilterAgent.calculate_relevance(startup, filters)
+                for startup in batch
+            ]
+
+            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Process results
+            for position, (startup, filter_result) in enumerate(zip(batch, batch_results), start=offset + i):
+                if isinstance(filter_result, Exception):
+                    logger.error(f"Filter failed for {startup.get('name')}: {str(filter_result)}")
+                    continue
+
+                if not filter_result.get("success"):
+                    logger.error(f"Filter failed for {startup.get('name')}: {filter_result.get('error')}")
+                    continue
 
-            # Process in batches of 10 for speed (reduces 110 startups from 14min to 2-3min)
-            batch_size = 10
+                relevance_score = filter_result.get("relevance_score", 0.0)
 
-            for i in range(0, len(startups), batch_size):
-                batch = startups[i:i + batch_size]
+                logger.info(f"🎯 {startup.get('name')}: Relevance Score = {relevance_score}")
 
-                # Run batch in parallel
-                tasks = [
-                    FilterAgent.calculate_relevance(startup, filters)
-                    for startup in batch
-                ]
+                # Score ALL startups (no threshold filtering here), keep the best K locally
+                startup["relevance_score"] = relevance_score
+                startup["filter_reasoning"] = filter_result.get("reasoning", "")
 
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+                # Buffered - persisted in bulk once per window
+                await self.score_buffer.add(startup.get("id"), relevance_score, startup["filter_reasoning"])
 
-                # Process results
-                for startup, filter_result in zip(batch, batch_results):
-                    if isinstance(filter_result, Exception):
-                        logger.error(f"Filter failed for {startup.get('name')}: {str(filter_result)}")
-                        continue
+                entry = (relevance_score or 0, -position, startup)
+                if len(local_top) < top_k:
+                    heapq.heappush(local_top, entry)
+                elif entry[:2] > local_top[0][:2]:
+                    heapq.heapreplace(local_top, entry)
 
-                    if not filter_result.get("success"):
-                        logger.error(f"Filter failed for {startup.get('name')}: {filter_result.get('error')}")
-                        continue
+            # Progress update after each batch (shared across shard workers)
+            self.filtered_count += len(batch)
+            progress_pct = 40 + int(self.filtered_count / total * 10)
+            await self.update_progress("filtering", progress_pct, f"Filtered {self.filtered_count}/{total} startups...")
 
-                    relevance_score = filter_result.get("relevance_score", 0.0)
+        return local_top
 
-                    logger.info(f"🎯 {startup.get('name')}: Relevance Score = {relevance_score}")
+    async def filter_startups(self, startups: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Filter startups using AI - map-reduce over shards!
+        Each shard worker scores its slice and returns a local top-K,
+        the local winners are merged into the global top-K before DD
+        """
+        try:
+            self.filtered_count = 0
+            shards = self.shard_candidates(startups, FILTER_WORKERS)
 
-                    # Update startup with relevance score
-                    self.supabase.table("startups").update({
-                        "relevance_score": relevance_score
-                    }).eq("id", startup.get("id")).execute()
+            logger.info(f"Filtering {len(startups)} startups across {len(shards)} shard workers")
 
-                    # Add ALL startups with their scores (no threshold filtering here)
-                    startup["relevance_score"] = relevance_score
-                    startup["filter_reasoning"] = filter_result.get("reasoning", "")
-                    filtered.append(startup)
+            try:
+                local_tops = await asyncio.gather(*[
+                    self.score_shard(offset, shard, filters, len(startups), SHORTLIST_SIZE)
+                    for offset, shard in shards
+                ])
+            finally:
+                # Persist whatever is still buffered before moving on to DD
+                await self.score_buffer.flush()
 
-                # Progress update after each batch
-                progress_pct = 40 + int((i + batch_size) / len(startups) * 10)
-                await self.update_progress("filtering", progress_pct, f"Filtered {min(i + batch_size, len(startups))}/{len(startups)} startups...")
+            # Reduce: merge local top-K lists into the global top-K (highest score first)
+            merged = heapq.nlargest(
+                SHORTLIST_SIZE,
+                (entry for local_top in local_tops for entry in local_top),
+                key=lambda entry: entry[:2]
+            )
 
-            if not filtered:
+            if not merged:
                 logger.warning("No startups passed filtering!")
                 return []
 
-            # Sort by relevance score (highest first)
-            filtered.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
+            top_k = [startup for _, _, startup in merged]
 
-            logger.info(f"📊 Top 10 scores: {[(s.get('name'), s.get('relevance_score')) for s in filtered[:10]]}")
+            logger.info(f"📊 Top scores: {[(s.get('name'), s.get('relevance_score')) for s in top_k]}")
+            logger.info(f"✅ Selected TOP {len(top_k)}: {[s.get('name') for s in top_k]}")
 
-            # Take top 5 BEST matches
-            top_5 = filtered[:5]
-            logger.info(f"✅ Selected TOP 5: {[s.get('name') for s in top_5]}")
-
-            return top_5
+            return top_k
 
         except Exception as e:
             logger.error(f"Filtering error: {str(e)}")
@@ -482,14 +705,24 @@ class JobProcessor:
                     "overall_summary": risk_result.get("overall_summary")
                 }
 
-                dd_response = self.supabase.table("due_diligence").insert(dd_entry).execute()
+                dd_row = await repository.insert_due_diligence(dd_entry)
 
-                if dd_response.data:
+                if dd_row:
                     results.append({
                         "startup": startup,
-                        "dd": dd_response.data[0]
+                        "dd": dd_row
                     })
 
+                    await event_bus.publish(
+                        self.job_id,
+                        "startup_completed",
+                        startup_id=startup.get("id"),
+                        name=startup.get("name"),
+                        success_rate=dd_row.get("success_rate"),
+                        completed=len(results),
+                        total=len(startups)
+                    )
+
             except Exception as e:
                 logger.error(f"DD processing error for {startup.get('name')}: {str(e)}")
                 continue
@@ -500,6 +733,7 @@ class JobProcessor:
         """Create final results entry"""
         try:
             top_startups = []
+            ranked_startups = []
 
             for i, result in enumerate(dd_results):
                 top_startups.append({
@@ -510,12 +744,26 @@ class JobProcessor:
                     "fit_reason": result["startup"].get("filter_reasoning")
                 })
 
+                ranked_startups.append({
+                    "rank": i + 1,
+                    "startup": result["startup"],
+                    "due_diligence": result["dd"],
+                    "fit_reason": result["startup"].get("filter_reasoning")
+                })
+
+            # Finished jobs never change - write the denormalised results document once
+            snapshot_path = await ResultSnapshot.save(
+                self.job_id,
+                ResultSnapshot.build(self.job_id, ranked_startups)
+            )
+
             result_entry = {
                 "job_id": self.job_id,
-                "top_startups": top_startups
+                "top_startups": top_startups,
+                "snapshot_path": snapshot_path
             }
 
-            self.supabase.table("results").insert(result_entry).execute()
+            await repository.insert_results(result_entry)
 
         except Exception as e:
             logger.error(f"Finalize error: {str(e)}")
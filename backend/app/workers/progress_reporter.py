@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Any, Optional
+from app.services import repository
+from app.services.cache import job_cache
+from app.services.event_bus import event_bus
+
+logger = logging.getLogger(__name__)
+
+# Minimum time between two progress writes for the same job
+PROGRESS_FLUSH_INTERVAL_MS = int(os.getenv("PROGRESS_FLUSH_INTERVAL_MS", "1000"))
+
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+
+class ProgressReporter:
+    """
+    Coalescing writer for a job's status + progress
+
+    Keeps the latest state in memory and writes it as ONE jobs update at most
+    every PROGRESS_FLUSH_INTERVAL_MS. Stage transitions and terminal states are
+    written immediately; anything reported in between is merged into a single
+    trailing write so the last state always lands.
+    """
+
+    def __init__(self, job_id: str, interval_ms: int = PROGRESS_FLUSH_INTERVAL_MS):
+        self.job_id = job_id
+        self.interval = interval_ms / 1000
+        self.progress: Optional[Dict[str, Any]] = None
+        self.status: Optional[str] = None
+        self.fields: Dict[str, Any] = {}
+        self.dirty = False
+        # Bumped on every state change - a flush only marks clean the version it wrote
+        self.version = 0
+        self.flushed_step: Optional[str] = None
+        self.flushed_status: Optional[str] = None
+        self.last_flush = 0.0
+        self.lock = asyncio.Lock()
+        self.trailing_flush: Optional[asyncio.Task] = None
+
+    async def report(self, step: str, percent: int, message: str, status: Optional[str] = None, **fields):
+        """Record the latest state - written now on stage/terminal changes, otherwise coalesced"""
+        self.progress = {
+            "step": step,
+            "percent": percent,
+            "status_message": message
+        }
+        if status:
+            self.status = status
+        self.fields.update(fields)
+        self.dirty = True
+        self.version += 1
+
+        stage_changed = step != self.flushed_step or self.status != self.flushed_status
+        elapsed = time.monotonic() - self.last_flush
+
+        if stage_changed or self.status in TERMINAL_STATUSES or elapsed >= self.interval:
+            await self.flush()
+        elif self.trailing_flush is None:
+            self.schedule_flush(self.interval - elapsed)
+
+        # Push every report to live subscribers - only the DB writes are coalesced
+        if self.status in TERMINAL_STATUSES:
+            event_type = self.status
+        else:
+            event_type = "stage" if stage_changed else "progress"
+        await event_bus.publish(self.job_id, event_type, status=self.status, progress=self.progress)
+
+    async def fail(self, error_message: str):
+        """Terminal failure - merged with any pending progress and written immediately"""
+        self.status = "failed"
+        self.fields["error_log"] = error_message
+        self.dirty = True
+        self.version += 1
+        await self.close()
+        await event_bus.publish(self.job_id, "failed", status="failed", progress=self.progress, error_log=error_message)
+
+    def schedule_flush(self, delay: float):
+        self.trailing_flush = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float):
+        try:
+            await asyncio.sleep(delay)
+            # Shielded: cancelling the trailing flush only cancels the wait, never a write under way
+            await asyncio.shield(self.flush())
+        finally:
+            if self.trailing_flush is asyncio.current_task():
+                self.trailing_flush = None
+
+        # Reports that arrived during the write saw this task pending and did not schedule their own
+        if self.dirty:
+            self.schedule_flush(self.interval)
+
+    async def flush(self):
+        """Write status (only when it changed), progress and extra columns in one update"""
+        async with self.lock:
+            if not self.dirty:
+                return
+
+            # Snapshot before the write - reports may land while it is in flight
+            version = self.version
+            fields = dict(self.fields)
+            progress = self.progress
+            status = self.status
+
+            data = dict(fields)
+            if progress:
+                data["progress"] = progress
+            if status and status != self.flushed_status:
+                data["status"] = status
+
+            try:
+                # A job cancelled from the API is left alone - status and progress alike
+                await repository.update_job(self.job_id, data, unless_status="cancelled")
+            except Exception as e:
+                logger.error(f"Failed to update progress: {str(e)}")
+                return
+
+            # Pollers must see the new state on their next request
+            await job_cache.invalidate_job(self.job_id)
+
+            # Only what was sent counts as written
+            for key, value in fields.items():
+                if key in self.fields and self.fields[key] is value:
+                    del self.fields[key]
+            self.flushed_step = progress.get("step") if progress else None
+            self.flushed_status = status
+            self.last_flush = time.monotonic()
+
+            if self.version == version:
+                self.dirty = False
+
+    async def close(self):
+        """Stop any scheduled write and flush the final state"""
+        task = self.trailing_flush
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            self.trailing_flush = None
+
+        # Waits on the lock for a write still in flight, then writes whatever it missed
+        await self.flush()
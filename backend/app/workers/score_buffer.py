@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Any, List
+from app.services import repository
+
+logger = logging.getLogger(__name__)
+
+# Flush buffered relevance scores once this many are pending or this much time has passed
+RELEVANCE_FLUSH_SIZE = int(os.getenv("RELEVANCE_FLUSH_SIZE", "50"))
+RELEVANCE_FLUSH_INTERVAL_MS = int(os.getenv("RELEVANCE_FLUSH_INTERVAL_MS", "2000"))
+
+
+class RelevanceScoreBuffer:
+    """
+    Buffers filter results for a job and persists them with one bulk upsert
+    per window instead of one UPDATE per startup
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.last_flush = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def add(self, startup_id: str, relevance_score: float, reasoning: str):
+        """Queue a score, flushing if the size or time window is exceeded"""
+        self.pending[startup_id] = {
+            "id": startup_id,
+            "job_id": self.job_id,
+            "relevance_score": relevance_score,
+            "filter_reasoning": reasoning
+        }
+
+        elapsed_ms = (time.monotonic() - self.last_flush) * 1000
+        if len(self.pending) >= RELEVANCE_FLUSH_SIZE or elapsed_ms >= RELEVANCE_FLUSH_INTERVAL_MS:
+            await self.flush()
+
+    async def flush(self):
+        """Write all pending scores in one upsert - failed rows stay queued for the next flush"""
+        async with self.lock:
+            if not self.pending:
+                return
+
+            rows: List[Dict[str, Any]] = list(self.pending.values())
+            self.pending = {}
+            self.last_flush = time.monotonic()
+
+            try:
+                await repository.upsert_startups(rows)
+                logger.info(f"Job {self.job_id}: persisted {len(rows)} relevance scores")
+            except Exception as e:
+                logger.error(f"Failed to persist {len(rows)} relevance scores: {str(e)}")
+                for row in rows:
+                    self.pending.setdefault(row["id"], row)
@@ -0,0 +1,94 @@
+"""
+Benchmark ExcelParser.parse_excel against the previous row-by-row implementation
+
+Builds a synthetic CSV export (100k rows by default), checks both versions
+return identical startups, and prints timings.
+
+Run from backend/:
+    python -m benchmarks.excel_parser_benchmark [rows]
+"""
+import io
+import logging
+import random
+import sys
+import time
+
+import pandas as pd
+
+from app.services.column_mapper import ColumnMapper
+from app.services.excel_parser import ExcelParser
+
+SECTORS = ["AI/ML", "FinTech", "HealthTech", "SaaS", "CleanTech", " EdTech "]
+STAGES = ["Pre-seed", "Seed", "Series A", "Series B", None]
+TICKETS = ["$500k-$1M", "$2M+", "1.5m", "250K", "$1M to $3M", "n/a", "", None, "750000", "1.2.3m", "$3m-"]
+
+
+def build_csv(rows: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    df = pd.DataFrame({
+        "Company Name": [None if i % 97 == 0 else f"Startup {i}" for i in range(rows)],
+        "Industry": [rng.choice(SECTORS) for _ in range(rows)],
+        "Funding Stage": [rng.choice(STAGES) for _ in range(rows)],
+        "Country": [rng.choice(["USA", "India", "Germany", "Singapore"]) for _ in range(rows)],
+        "Ticket Size": [rng.choice(TICKETS) for _ in range(rows)],
+        "Description": [f"  Builds product {i} for customers  " for i in range(rows)],
+        "Website": [f"https://startup{i}.example" for i in range(rows)],
+        "Team": [rng.choice(["Jane (CEO)", "", None]) for _ in range(rows)],
+        "Employees": [rng.randint(1, 500) for _ in range(rows)],
+    })
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def legacy_parse_excel(file_bytes: bytes) -> list:
+    """The iterrows loop parse_excel used before vectorisation (CSV only)"""
+    df = pd.read_csv(io.BytesIO(file_bytes))
+    df.columns = df.columns.str.lower().str.strip()
+    df_cols = df.columns.tolist()
+
+    column_map = {field: df_cols[index] for field, index in ColumnMapper.map_headers(df_cols).items()}
+
+    startups = []
+    for idx, row in df.iterrows():
+        startup = {
+            field: str(row.get(column_map.get(field, field), "")).strip()
+            for field in ExcelParser.OUTPUT_FIELDS
+        }
+
+        if not startup["name"] or startup["name"] == "nan":
+            continue
+
+        if startup["ticket_size"] and startup["ticket_size"] != "nan":
+            startup["parsed_ticket_size"] = ExcelParser.parse_ticket_size(startup["ticket_size"])
+
+        startups.append(startup)
+
+    return startups
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    # The legacy path logs a warning for every malformed ticket size
+    logging.disable(logging.WARNING)
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    data = build_csv(rows)
+
+    legacy, legacy_seconds = timed(legacy_parse_excel, data)
+    current, current_seconds = timed(ExcelParser.parse_excel, data, "export.csv")
+
+    assert current["success"], current.get("error")
+    assert current["startups"] == legacy, "vectorised output differs from the row-by-row version"
+
+    print(f"rows: {rows} ({len(legacy)} startups, {len(data) / 1e6:.1f} MB CSV)")
+    print(f"iterrows:   {legacy_seconds:.2f}s")
+    print(f"vectorised: {current_seconds:.2f}s")
+    print(f"speedup:    {legacy_seconds / current_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,17 +9,21 @@ CREATE TABLE IF NOT EXISTS jobs (
   filters JSONB,                 -- {sector, stage, geography, ticket_min, ticket_max, context_text}
   user_token TEXT,               -- anonymous shareable token/UUID
   progress JSONB,                -- {step: "...", percent: N, status_message: "..."}
-  error_log TEXT
+  error_log TEXT,
+  fingerprint TEXT,              -- sha256 of input files + sheet URL + normalised filters
+  source_job_id UUID REFERENCES jobs(id) ON DELETE CASCADE -- set on deduplicated jobs: the job whose startups back the results
 );
 
 -- Files table: uploaded sources
 CREATE TABLE IF NOT EXISTS files (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   job_id UUID REFERENCES jobs(id) ON DELETE CASCADE,
-  file_type TEXT,                -- pdf|sheet|url
+  file_type TEXT,                -- pdf|excel|csv|zip|sheet
   original_name TEXT,
   storage_path TEXT,             -- Supabase storage path
-  parsed JSONB,                  -- parsed content / summary (filled after parsing)
+  upload_status TEXT DEFAULT 'ready', -- pending|ready|failed (uploads finish after the job is enqueued)
+  content_hash TEXT,             -- sha256 of the uploaded bytes, computed while scanning the upload
+  parsed JSONB,                  -- parse summary + content_ref to the gzipped full extraction in storage
   created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
 );
 
@@ -37,6 +41,7 @@ CREATE TABLE IF NOT EXISTS startups (
   summary TEXT,
   metadata JSONB,                -- team, traction, links, raw claims
   relevance_score FLOAT,         -- from filter agent 0-1
+  filter_reasoning TEXT,         -- filter agent explanation for the score
   created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
 );
 
@@ -67,14 +72,35 @@ CREATE TABLE IF NOT EXISTS results (
   job_id UUID REFERENCES jobs(id) ON DELETE CASCADE,
   top_startups JSONB,            -- [{"startup_id":..., "rank":1, "fit_reason":"..."}]
   one_pager_path TEXT,           -- Supabase storage path for compiled PDF
+  snapshot_path TEXT,            -- Supabase storage path for the gzipped results snapshot
   created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
 );
 
+-- Document cache: PDF extraction + parser agent output, shared across jobs
+CREATE TABLE IF NOT EXISTS document_cache (
+  cache_key TEXT PRIMARY KEY,    -- <sha256 of the PDF>:pdf-<parser version>:prompt-<prompt version>-<extraction mode>:opts-<extraction settings digest>
+  content_hash TEXT,             -- sha256 of the PDF bytes
+  parsed JSONB,                  -- files.parsed document (summary + content_ref)
+  extracted JSONB,               -- structured parser agent result
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+
+-- Migrations for existing databases
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS fingerprint TEXT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS source_job_id UUID REFERENCES jobs(id) ON DELETE CASCADE;
+ALTER TABLE startups ADD COLUMN IF NOT EXISTS filter_reasoning TEXT;
+ALTER TABLE results ADD COLUMN IF NOT EXISTS snapshot_path TEXT;
+ALTER TABLE files ADD COLUMN IF NOT EXISTS upload_status TEXT DEFAULT 'ready';
+ALTER TABLE files ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
 CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_fingerprint ON jobs(fingerprint, status, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_files_job_id ON files(job_id);
 CREATE INDEX IF NOT EXISTS idx_startups_job_id ON startups(job_id);
 CREATE INDEX IF NOT EXISTS idx_startups_relevance_score ON startups(relevance_score);
+CREATE INDEX IF NOT EXISTS idx_startups_job_relevance ON startups(job_id, relevance_score DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_due_diligence_startup_id ON due_diligence(startup_id);
 CREATE INDEX IF NOT EXISTS idx_results_job_id ON results(job_id);
+CREATE INDEX IF NOT EXISTS idx_document_cache_content_hash ON document_cache(content_hash);
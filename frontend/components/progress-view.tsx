@@ -3,7 +3,7 @@
 import { motion } from "framer-motion"
 import { Brain, Filter, Search, BarChart3, Flame, Check } from "lucide-react"
 import { useState, useEffect } from "react"
-import { getJobStatus } from "@/lib/api"
+import { getJobStatus, subscribeToJobEvents } from "@/lib/api"
 
 const agents = [
   { name: "Qwen3-VL", icon: Brain, task: "Parsing pitch decks", x: 50, y: 20 },
@@ -35,49 +35,75 @@ export function ProgressView({ jobId, onComplete }: ProgressViewProps) {
   const [statusMessage, setStatusMessage] = useState("Initializing...")
 
   useEffect(() => {
-    // Poll job status every 3 seconds - NO MOCK DATA
-    const pollInterval = setInterval(async () => {
-      try {
-        const jobData = await getJobStatus(jobId)
-
-        // Update status message
-        const progress = jobData.progress || {}
-        setStatusMessage(progress.status_message || "Processing...")
-
-        // Map job status to agent steps
-        const status = jobData.status
-        if (status === "parsing") {
-          setActiveAgent(0)
-          setCompletedSteps([])
-        } else if (status === "filtering") {
-          setActiveAgent(1)
-          setCompletedSteps([0])
-        } else if (status === "dd_running") {
-          const percent = progress.percent || 60
-          if (percent >= 60 && percent < 70) {
-            setActiveAgent(2)
-            setCompletedSteps([0, 1])
-          } else if (percent >= 70 && percent < 80) {
-            setActiveAgent(3)
-            setCompletedSteps([0, 1, 2])
-          } else {
-            setActiveAgent(4)
-            setCompletedSteps([0, 1, 2, 3])
-          }
-        } else if (status === "completed") {
-          setCompletedSteps([0, 1, 2, 3, 4])
-          clearInterval(pollInterval)
-          setTimeout(() => onComplete(), 2000)
-        } else if (status === "failed") {
-          clearInterval(pollInterval)
-          alert(`Job failed: ${jobData.error_log || "Unknown error"}`)
+    let pollInterval: ReturnType<typeof setInterval> | undefined
+    let finished = false
+
+    const applyJob = (jobData: any) => {
+      if (finished) return
+
+      // Update status message
+      const progress = jobData.progress || {}
+      setStatusMessage(progress.status_message || "Processing...")
+
+      // Map job status to agent steps
+      const status = jobData.status
+      if (status === "parsing") {
+        setActiveAgent(0)
+        setCompletedSteps([])
+      } else if (status === "filtering") {
+        setActiveAgent(1)
+        setCompletedSteps([0])
+      } else if (status === "dd_running") {
+        const percent = progress.percent || 60
+        if (percent >= 60 && percent < 70) {
+          setActiveAgent(2)
+          setCompletedSteps([0, 1])
+        } else if (percent >= 70 && percent < 80) {
+          setActiveAgent(3)
+          setCompletedSteps([0, 1, 2])
+        } else {
+          setActiveAgent(4)
+          setCompletedSteps([0, 1, 2, 3])
         }
-      } catch (error) {
-        console.error("Failed to poll job status:", error)
+      } else if (status === "completed") {
+        finished = true
+        setCompletedSteps([0, 1, 2, 3, 4])
+        stop()
+        setTimeout(() => onComplete(), 2000)
+      } else if (status === "failed") {
+        finished = true
+        stop()
+        alert(`Job failed: ${jobData.error_log || "Unknown error"}`)
       }
-    }, 3000)
-
-    return () => clearInterval(pollInterval)
+    }
+
+    // Fallback: poll job status every 3 seconds - NO MOCK DATA
+    const startPolling = () => {
+      if (finished || pollInterval) return
+      pollInterval = setInterval(async () => {
+        try {
+          applyJob(await getJobStatus(jobId))
+        } catch (error) {
+          console.error("Failed to poll job status:", error)
+        }
+      }, 3000)
+    }
+
+    // Prefer pushed updates - the stream only carries status/progress changes
+    const source = subscribeToJobEvents(
+      jobId,
+      (event) => {
+        if (event.status || event.progress) applyJob(event)
+      },
+      startPolling
+    )
+
+    function stop() {
+      source.close()
+      if (pollInterval) clearInterval(pollInterval)
+    }
+
+    return () => stop()
   }, [jobId, onComplete])
 
   return (
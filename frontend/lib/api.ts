@@ -72,3 +72,27 @@ export async function getJobStatus(jobId: string) {
 export async function getJobResults(jobId: string) {
   return await apiCall(`/api/jobs/${jobId}/results`)
 }
+
+// Subscribe to pushed job progress (Server-Sent Events)
+// Returns the EventSource so the caller can close it
+export function subscribeToJobEvents(
+  jobId: string,
+  onEvent: (event: any) => void,
+  onError: () => void
+) {
+  const source = new EventSource(`${API_URL}/api/jobs/${jobId}/events`)
+  const eventTypes = ['snapshot', 'stage', 'progress', 'startup_completed', 'completed', 'failed', 'cancelled']
+
+  eventTypes.forEach((type) => {
+    source.addEventListener(type, (message) => {
+      onEvent(JSON.parse((message as MessageEvent).data))
+    })
+  })
+
+  source.onerror = () => {
+    source.close()
+    onError()
+  }
+
+  return source
+}